@@ -1,32 +1,61 @@
 import re
+import hashlib
 from typing import List, Dict, Optional
 from collections import Counter
-import json
+from functools import lru_cache
 from pathlib import Path
+from utils import read_json, file_stamp, cache_load, cache_dump
 
 # Try importing sklearn, but don't fail if missing
 try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.linear_model import LogisticRegression
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from sklearn.linear_model import SGDClassifier
     from sklearn.pipeline import Pipeline
     HAS_sklearn = True
 except ImportError:
     HAS_sklearn = False
 
+# Optional Aho-Corasick automaton for rule sets made only of plain substrings
+try:
+    import ahocorasick
+    HAS_ahocorasick = True
+except ImportError:
+    HAS_ahocorasick = False
+
+# Anything beyond '|' means a rule really needs the regex engine
+_REGEX_META = re.compile(r"[\\.^$*+?{}\[\]()]")
+
 class RuleCategorizer:
+    # Below this many literals the generated matcher beats the automaton
+    AUTOMATON_MIN_LITERALS = 32
+    # Loaded and compiled rule sets shared across instances, keyed on the
+    # rules file and its stamp so an edited file is picked up
+    _shared = {}
+
     def __init__(self, rules_path: str = None):
-        self.rules = []
+        key = (str(rules_path), file_stamp(rules_path)) if rules_path else None
+        shared = RuleCategorizer._shared.get(key)
+        if shared is None:
+            self.rules = self._load_rules(rules_path)
+            self._compile_rules()
+            RuleCategorizer._shared[key] = (self.rules, self._compiled_rules, self._fast_categorize, self._automaton)
+        else:
+            rules, self._compiled_rules, self._fast_categorize, self._automaton = shared
+            self.rules = list(rules)
+
+    @staticmethod
+    def _load_rules(rules_path: str = None) -> List[Dict]:
+        rules = []
         if rules_path and Path(rules_path).exists():
-            with open(rules_path, 'r') as f:
-                # Expecting JSON or YAML format rules
-                # For simplicity, we'll start with JSON structure list
-                try:
-                    self.rules = json.load(f)
-                except:
-                    pass
+            # Expecting JSON or YAML format rules
+            # For simplicity, we'll start with JSON structure list
+            try:
+                rules = read_json(rules_path)
+            except:
+                pass
         else:
             # Default rules
-            self.rules = [
+            rules = [
                 {"pattern": "UBER|LYFT", "category": "Transport", "regex": True},
                 {"pattern": "SAFEWAY|TRADER JOE|WHOLE FOODS", "category": "Groceries", "regex": True},
                 {"pattern": "NETFLIX|SPOTIFY|HBO|DISNEY", "category": "Entertainment", "regex": True},
@@ -35,34 +64,135 @@ class RuleCategorizer:
                 {"pattern": "STARBUCKS|COFFEE|CAFE|PEET'S", "category": "Dining", "regex": True},
                 {"pattern": "RESTAURANT|DINER|PIZZA|BURGER|SUSHI", "category": "Dining", "regex": True},
             ]
+        return rules
 
-    def categorize(self, description: str, amount: float = 0) -> Optional[str]:
-        desc_upper = description.upper()
-        
+    def _compile_rules(self):
+        """
+        Precompile all rules once and generate a straight-line matcher for them.
+        Call again after changing self.rules.
+        """
+        self._compiled_rules = []
         for rule in self.rules:
             pattern = rule.get("pattern", "").upper()
-            is_regex = rule.get("regex", False)
-            category = rule.get("category")
-            
-            # Simple amount check if rule has it
-            min_amt = rule.get("min_amount")
-            max_amt = rule.get("max_amount")
-            if min_amt is not None and amount < min_amt: continue
-            if max_amt is not None and amount > max_amt: continue
-            
-            if is_regex:
-                if re.search(pattern, desc_upper):
-                    return category
+            if not rule.get("regex", False):
+                pattern = re.escape(pattern)
+            self._compiled_rules.append((
+                re.compile(pattern),
+                rule.get("category"),
+                rule.get("min_amount"),
+                rule.get("max_amount"),
+            ))
+
+        self._fast_categorize = self._generate_matcher()
+        self._automaton = self._build_automaton()
+
+    def _generate_matcher(self):
+        """
+        Emit one function with an inline check per rule, in rule order:
+            if amount >= _lo0 and ('UBER' in d or 'LYFT' in d): return _c0
+        Literal rules become plain substring tests, the rest call their
+        precompiled pattern. Values are passed through the namespace rather
+        than embedded in the source.
+        """
+        namespace = {}
+        lines = ["def _categorize(d, amount):"]
+        for i, (rule, compiled) in enumerate(zip(self.rules, self._compiled_rules)):
+            pattern, category, min_amt, max_amt = compiled
+            namespace[f"_c{i}"] = category
+            conditions = []
+            if min_amt is not None:
+                namespace[f"_lo{i}"] = min_amt
+                conditions.append(f"amount >= _lo{i}")
+            if max_amt is not None:
+                namespace[f"_hi{i}"] = max_amt
+                conditions.append(f"amount <= _hi{i}")
+
+            literals = self._rule_literals(rule)
+            if literals is None:
+                namespace[f"_p{i}"] = pattern.search
+                conditions.append(f"_p{i}(d)")
             else:
-                if pattern in desc_upper:
-                    return category
-                    
-        return None
+                conditions.append("(" + " or ".join(f"{lit!r} in d" for lit in literals) + ")")
+            lines.append(f"    if {' and '.join(conditions)}: return _c{i}")
+        lines.append("    return None")
+
+        exec(compile("\n".join(lines), "<RuleCategorizer>", "exec"), namespace)
+        return namespace["_categorize"]
+
+    def _rule_literals(self, rule: Dict) -> Optional[List[str]]:
+        """Split a rule into the substrings it matches, or None if it isn't literal."""
+        pattern = rule.get("pattern", "").upper()
+        if rule.get("regex", False):
+            if _REGEX_META.search(pattern):
+                return None
+            literals = pattern.split("|")
+        else:
+            literals = [pattern]
+        if not all(literals):
+            return None
+        return literals
+
+    def _build_automaton(self):
+        """
+        Build one Aho-Corasick automaton over every rule literal, mapping each
+        literal to the indices of the rules containing it. Only used for large
+        rule sets where every rule is literal, otherwise priority couldn't be kept.
+        """
+        if not HAS_ahocorasick or not self.rules:
+            return None
+        rule_literals = [self._rule_literals(rule) for rule in self.rules]
+        if any(literals is None for literals in rule_literals):
+            return None
+        if sum(len(literals) for literals in rule_literals) < self.AUTOMATON_MIN_LITERALS:
+            return None
+
+        automaton = ahocorasick.Automaton()
+        for i, literals in enumerate(rule_literals):
+            for literal in literals:
+                indices = automaton.get(literal, None)
+                if indices is None:
+                    automaton.add_word(literal, [i])
+                elif indices[-1] != i:
+                    indices.append(i)
+        automaton.make_automaton()
+        return automaton
+
+    def categorize(self, description: str, amount: float = 0) -> Optional[str]:
+        desc_upper = description.upper()
+
+        if self._automaton is not None:
+            # Single pass over the description; lowest rule index still wins
+            hits = sorted({i for _, indices in self._automaton.iter(desc_upper) for i in indices})
+            for i in hits:
+                _, category, min_amt, max_amt = self._compiled_rules[i]
+                if min_amt is not None and amount < min_amt: continue
+                if max_amt is not None and amount > max_amt: continue
+                return category
+            return None
+
+        return self._fast_categorize(desc_upper, amount)
+
+    def categorize_many(self, descriptions: List[str], amounts: List[float] = None) -> List[Optional[str]]:
+        """Categorize a batch of descriptions (e.g. a whole import) in one call."""
+        if amounts is None:
+            amounts = [0] * len(descriptions)
+        return [self.categorize(desc, amt) for desc, amt in zip(descriptions, amounts)]
 
 class MLCategorizer:
+    PREDICT_CACHE_SIZE = 4096
+    # Hashed feature space. The classifier keeps one weight per feature and
+    # category, so this (not the data) sets the model size; merchant notes use
+    # far fewer distinct tokens than this
+    N_FEATURES = 2**16
+
     def __init__(self):
         self.model = None
         self.is_trained = False
+        self._reset_cache()
+
+    def _reset_cache(self):
+        # Merchant strings repeat a lot, so memoize per model
+        self._predict_cached = lru_cache(maxsize=self.PREDICT_CACHE_SIZE)(self._raw_predict)
 
     def train(self, transactions: List[Dict]):
         """
@@ -71,7 +201,92 @@ class MLCategorizer:
         """
         if not HAS_sklearn:
             return
+        self._fit(*self._extract_training_data(transactions))
+
+    def ensure_trained(self, transactions: List[Dict], model_path: str = None):
+        """
+        Like train(), but reuses the model pickled at model_path when it was
+        fitted on exactly the same notes and categories, and saves it otherwise.
+        """
+        if not HAS_sklearn:
+            return
+        descriptions, categories = self._extract_training_data(transactions)
+        if model_path is None:
+            self._fit(descriptions, categories)
+            return
+
+        fingerprint = self._fingerprint(descriptions, categories)
+        model = cache_load(model_path, fingerprint)
+        if model is not None:
+            self.model = model
+            self.is_trained = True
+            self._reset_cache()
+            return
+
+        self._fit(descriptions, categories)
+        if self.is_trained:
+            cache_dump(model_path, fingerprint, self.model)
+
+    @staticmethod
+    def _fingerprint(descriptions: List[str], categories: List[str]) -> tuple:
+        # str hashes are salted per process, so digest the data instead
+        digest = hashlib.sha256()
+        for desc, cat in zip(descriptions, categories):
+            digest.update(f"{desc}\0{cat}\n".encode('utf-8', 'surrogatepass'))
+        return (len(descriptions), digest.hexdigest())
+
+    def _fit(self, descriptions: List[str], categories: List[str]):
+        if len(descriptions) < 10: # Minimum data to bother training
+            return
+
+        # Hashing keeps no vocabulary in memory and is stateless, which lets
+        # update() feed new rows to the classifier without refitting anything.
+        self.model = Pipeline([
+            ('hv', HashingVectorizer(stop_words='english', alternate_sign=False,
+                                     n_features=self.N_FEATURES, ngram_range=(1, 2))),
+            ('clf', SGDClassifier(loss='log_loss', random_state=42))
+        ])
+        
+        try:
+            self.model.fit(descriptions, categories)
+            # Most weights stay zero: store them sparse, in memory and when pickled
+            self.model.named_steps['clf'].sparsify()
+            self.is_trained = True
+        except Exception:
+            self.is_trained = False
+        self._reset_cache()
+
+    def update(self, transactions: List[Dict]):
+        """
+        Incrementally train on new transactions with partial_fit.
+        Falls back to a full train() if there is no model yet. Rows whose
+        category the model has never seen are skipped; retrain to pick them up.
+        """
+        if not HAS_sklearn:
+            return
+        if not self.is_trained or not self.model:
+            self.train(transactions)
+            return
 
+        clf = self.model.named_steps['clf']
+        known = set(clf.classes_)
+        descriptions, categories = self._extract_training_data(transactions)
+        rows = [(d, c) for d, c in zip(descriptions, categories) if c in known]
+        if not rows:
+            return
+
+        try:
+            X = self.model.named_steps['hv'].transform([d for d, _ in rows])
+            # partial_fit needs dense weights
+            clf.densify()
+            clf.partial_fit(X, [c for _, c in rows])
+        except Exception:
+            return
+        finally:
+            clf.sparsify()
+        self._reset_cache()
+
+    def _extract_training_data(self, transactions: List[Dict]):
         descriptions = []
         categories = []
         
@@ -82,25 +297,28 @@ class MLCategorizer:
             if desc and cat:
                 descriptions.append(desc)
                 categories.append(cat)
-        
-        if len(descriptions) < 10: # Minimum data to bother training
-            return
+        return descriptions, categories
 
-        self.model = Pipeline([
-            ('tfidf', TfidfVectorizer(stop_words='english', max_features=1000)),
-            ('clf', LogisticRegression(random_state=42))
-        ])
-        
+    def _raw_predict(self, description: str) -> Optional[str]:
         try:
-            self.model.fit(descriptions, categories)
-            self.is_trained = True
-        except Exception:
-            self.is_trained = False
+            return self.model.predict([description])[0]
+        except:
+            return None
 
     def predict(self, description: str) -> Optional[str]:
         if not self.is_trained or not self.model:
             return None
+        return self._predict_cached(description)
+
+    def predict_many(self, descriptions: List[str]) -> List[Optional[str]]:
+        """Predict a batch in one vectorized call, running each distinct description once."""
+        if not self.is_trained or not self.model:
+            return [None] * len(descriptions)
+        unique = list(set(descriptions))
+        if not unique:
+            return []
         try:
-            return self.model.predict([description])[0]
+            predicted = dict(zip(unique, self.model.predict(unique)))
         except:
-            return None
+            return [None] * len(descriptions)
+        return [predicted[desc] for desc in descriptions]
@@ -0,0 +1,36 @@
+"""Shell completion scripts, only imported by the completions commands."""
+
+BASH_COMPLETION = '''
+_spend_completion() {
+    local IFS=$'\\n'
+    COMPREPLY=( $(env COMP_WORDS="${COMP_WORDS[*]}" \\
+                      COMP_CWORD=$COMP_CWORD \\
+                      _SPEND_COMPLETE=bash_complete $1) )
+    return 0
+}
+complete -o default -F _spend_completion spend
+'''
+
+ZSH_COMPLETION = '''
+#compdef spend
+_spend() {
+    eval $(env _SPEND_COMPLETE=zsh_source spend)
+}
+compdef _spend spend
+'''
+
+FISH_COMPLETION = '''
+complete -c spend -f
+complete -c spend -n "__fish_use_subcommand" -a "add" -d "Add expense"
+complete -c spend -n "__fish_use_subcommand" -a "list" -d "List expenses"
+complete -c spend -n "__fish_use_subcommand" -a "delete" -d "Delete expense"
+complete -c spend -n "__fish_use_subcommand" -a "edit" -d "Edit expense"
+complete -c spend -n "__fish_use_subcommand" -a "budget" -d "Budget management"
+complete -c spend -n "__fish_use_subcommand" -a "insights" -d "Analytics"
+complete -c spend -n "__fish_use_subcommand" -a "import" -d "Import data"
+complete -c spend -n "__fish_use_subcommand" -a "export" -d "Export data"
+complete -c spend -n "__fish_use_subcommand" -a "sync" -d "Cloud sync"
+complete -c spend -n "__fish_use_subcommand" -a "tui" -d "Interactive mode"
+complete -c spend -n "__fish_use_subcommand" -a "graph" -d "Visualize data"
+complete -c spend -n "__fish_use_subcommand" -a "version" -d "Show version"
+'''
@@ -1,7 +1,8 @@
 import os
-import json
+import functools
 from pathlib import Path
 from platformdirs import user_data_dir
+from utils import read_json, write_json
 
 # 1. Define App Metadata
 APP_NAME = "dot-spend"
@@ -13,25 +14,30 @@ APP_AUTHOR = "Personal"
 DATA_DIR = Path(user_data_dir(APP_NAME, APP_AUTHOR))
 DATA_FILE = DATA_DIR / "expenses.json"
 BUDGET_FILE = DATA_DIR / "budgets.json"
-HISTORY_FILE = DATA_DIR / "history.json"
+HISTORY_FILE = DATA_DIR / "history.jsonl"
 
 # 3. Ensure Directory Exists
+# Set once init_storage has run, so later calls in the same process are free
+_initialized = False
+
 def init_storage():
     """Checks if storage folder exists, creates it if not."""
+    global _initialized
+    if _initialized:
+        return
+
     if not DATA_DIR.exists():
         DATA_DIR.mkdir(parents=True, exist_ok=True)
     
     if not DATA_FILE.exists():
-        with open(DATA_FILE, 'w') as f:
-            json.dump([], f)
+        write_json(DATA_FILE, [])
 
     if not BUDGET_FILE.exists():
-        with open(BUDGET_FILE, 'w') as f:
-            json.dump({}, f)
+        write_json(BUDGET_FILE, {})
 
     if not HISTORY_FILE.exists():
-        with open(HISTORY_FILE, 'w') as f:
-            json.dump({"transactions": []}, f)
+        HISTORY_FILE.touch()
+    _initialized = True
 
 def get_data_path():
     return DATA_FILE
@@ -47,18 +53,22 @@ def get_db_path():
 
 SETTINGS_FILE = DATA_DIR / "settings.json"
 
-def load_settings():
+@functools.cache
+def _read_settings():
     if not SETTINGS_FILE.exists():
         return {"storage_backend": "json"}
     try:
-        with open(SETTINGS_FILE, "r") as f:
-            return json.load(f)
+        return read_json(SETTINGS_FILE)
     except:
         return {"storage_backend": "json"}
 
+def load_settings():
+    # Read once per process; callers get a copy they are free to modify
+    return dict(_read_settings())
+
 def save_settings(settings):
-    with open(SETTINGS_FILE, "w") as f:
-        json.dump(settings, f, indent=4)
+    write_json(SETTINGS_FILE, settings)
+    _read_settings.cache_clear()
 
 def get_storage_backend():
     return load_settings().get("storage_backend", "json")
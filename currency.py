@@ -1,10 +1,12 @@
 """Multi-currency support with exchange rate handling."""
-import json
+import functools
+import sys
 import requests
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Optional
 from config import DATA_DIR
+from utils import read_json, write_json
 
 CURRENCY_FILE = DATA_DIR / "currency.json"
 RATES_FILE = DATA_DIR / "exchange_rates.json"
@@ -12,6 +14,10 @@ RATES_FILE = DATA_DIR / "exchange_rates.json"
 # Free API - no key required (limited requests)
 EXCHANGE_API = "https://api.exchangerate-api.com/v4/latest/"
 
+# Shared session so repeated refreshes reuse the same keep-alive connection
+_SESSION = requests.Session()
+_SESSION.headers.update({"Accept-Encoding": "gzip"})
+
 SUPPORTED_CURRENCIES = [
     "USD", "EUR", "GBP", "JPY", "CAD", "AUD", "CHF", "CNY",
     "INR", "MXN", "BRL", "KRW", "SGD", "HKD", "NOK", "SEK",
@@ -28,28 +34,38 @@ CURRENCY_SYMBOLS = {
 
 class CurrencyManager:
     def __init__(self):
-        self.config = self._load_config()
-        self.rates = self._load_rates()
+        self._rate_cache = {}
+    
+    # Config and rates are read from disk on first access only
+    @functools.cached_property
+    def config(self) -> Dict:
+        return self._load_config()
+    
+    @functools.cached_property
+    def rates(self) -> Dict:
+        return self._load_rates()
     
     def _load_config(self) -> Dict:
         if CURRENCY_FILE.exists():
-            with open(CURRENCY_FILE) as f:
-                return json.load(f)
+            return read_json(CURRENCY_FILE)
         return {"base": "USD", "auto_convert": True, "last_update": None}
     
     def _save_config(self):
-        with open(CURRENCY_FILE, "w") as f:
-            json.dump(self.config, f, indent=2)
+        write_json(CURRENCY_FILE, self.config)
     
     def _load_rates(self) -> Dict:
         if RATES_FILE.exists():
-            with open(RATES_FILE) as f:
-                return json.load(f)
+            return self._intern_codes(read_json(RATES_FILE))
         return {"base": "USD", "rates": {"USD": 1.0}, "date": None}
     
+    @staticmethod
+    def _intern_codes(rates: Dict) -> Dict:
+        # Interned keys let get_rate's lookups match on identity
+        rates["rates"] = {sys.intern(code): rate for code, rate in rates.get("rates", {}).items()}
+        return rates
+    
     def _save_rates(self):
-        with open(RATES_FILE, "w") as f:
-            json.dump(self.rates, f, indent=2)
+        write_json(RATES_FILE, self.rates)
     
     @property
     def base_currency(self) -> str:
@@ -61,19 +77,30 @@ class CurrencyManager:
             return False
         self.config["base"] = currency
         self._save_config()
+        self._rate_cache.clear()
         return True
     
     def update_rates(self) -> bool:
         """Fetch latest exchange rates from API."""
+        headers = {}
+        # Only ask for a body if the rates changed since our last download
+        if self.rates.get("base") == self.base_currency and self.rates.get("last_modified"):
+            headers["If-Modified-Since"] = self.rates["last_modified"]
         try:
-            response = requests.get(f"{EXCHANGE_API}{self.base_currency}", timeout=10)
+            response = _SESSION.get(f"{EXCHANGE_API}{self.base_currency}", headers=headers, timeout=10)
+            if response.status_code == 304:
+                self.config["last_update"] = datetime.now().isoformat()
+                self._save_config()
+                return True
             if response.status_code == 200:
                 data = response.json()
-                self.rates = {
+                self.rates = self._intern_codes({
                     "base": data["base"],
                     "rates": data["rates"],
-                    "date": datetime.now().isoformat()
-                }
+                    "date": datetime.now().isoformat(),
+                    "last_modified": response.headers.get("Last-Modified")
+                })
+                self._rate_cache.clear()
                 self._save_rates()
                 self.config["last_update"] = datetime.now().isoformat()
                 self._save_config()
@@ -87,12 +114,19 @@ class CurrencyManager:
         if to_currency is None:
             to_currency = self.base_currency
         
-        from_currency = from_currency.upper()
-        to_currency = to_currency.upper()
+        from_currency = sys.intern(from_currency.upper())
+        to_currency = sys.intern(to_currency.upper())
         
         if from_currency == to_currency:
             return 1.0
-        
+
+        key = (from_currency, to_currency, self.rates.get("base"), self.rates.get("date"))
+        rate = self._rate_cache.get(key)
+        if rate is None:
+            rate = self._rate_cache[key] = self._compute_rate(from_currency, to_currency)
+        return rate
+
+    def _compute_rate(self, from_currency: str, to_currency: str) -> float:
         rates = self.rates.get("rates", {})
         
         # If base matches, direct lookup
@@ -131,3 +165,8 @@ class CurrencyManager:
             return datetime.now() - update_time > timedelta(hours=max_age_hours)
         except:
             return True
+
+@functools.cache
+def get_manager() -> CurrencyManager:
+    """Process-wide CurrencyManager, so currency files are read once."""
+    return CurrencyManager()
@@ -1,45 +1,82 @@
+import os
 import json
-import uuid
+import secrets
 import datetime
 from pathlib import Path
 from config import get_data_path, get_budget_path
+from utils import read_json, write_json, json_loads, file_stamp, cache_load, cache_dump
+
+# Sidecar kind for the plain row list kept here; JSONDataStore pickles a
+# different shape under the default kind
+CACHE_KIND = 'rows'
+
+def get_log_path():
+    """Append-only log of expenses added since the JSON file was last rewritten."""
+    return get_data_path().with_suffix('.jsonl')
+
+def _replay_log(data):
+    log_path = get_log_path()
+    if not log_path.exists():
+        return
+    with open(log_path, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                data.append(json_loads(line))
+            except json.JSONDecodeError:
+                continue # Torn write from a crash, skip it
 
 def load_data():
-    """Load expenses from JSON file."""
+    """Load expenses from the JSON file plus anything appended to the log."""
     path = get_data_path()
-    if not path.exists():
+    if not path.exists() and not get_log_path().exists():
         return []
+    stamp = file_stamp(path, get_log_path())
+    cached = cache_load(path, stamp, CACHE_KIND)
+    if cached is not None:
+        return cached
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = read_json(path) if path.exists() else []
+        _replay_log(data)
             
         # Migration: Ensure IDs and Timestamps
         modified = False
+        now = None
         for entry in data:
             if 'id' not in entry:
-                entry['id'] = str(uuid.uuid4())[:8]
+                entry['id'] = secrets.token_hex(4)
                 modified = True
             if 'timestamp' not in entry:
                 # Try to parse 'date' or use now
                 try:
-                    dt = datetime.datetime.strptime(entry['date'], "%Y-%m-%d %H:%M")
+                    # 'YYYY-MM-DD HH:MM' is valid ISO, and fromisoformat is far cheaper than strptime
+                    dt = datetime.datetime.fromisoformat(entry['date'])
                     entry['timestamp'] = dt.isoformat()
                 except:
-                    entry['timestamp'] = datetime.datetime.now().isoformat()
+                    if now is None:
+                        now = datetime.datetime.now().isoformat()
+                    entry['timestamp'] = now
                 modified = True
         
-        if modified:
+        # Persisting the fixed-up rows can be turned off to keep reads read-only
+        if modified and os.environ.get("DOTSPEND_AUTO_MIGRATE", "1") == "1":
             save_data(data)
+        else:
+            cache_dump(path, stamp, data, CACHE_KIND)
             
         return data
     except (json.JSONDecodeError, FileNotFoundError):
         return []
 
 def save_data(data):
-    """Save expenses to JSON file."""
+    """Save expenses to JSON file, folding in (and dropping) the append log."""
     path = get_data_path()
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4)
+    write_json(path, data, indent=False)
+    log_path = get_log_path()
+    if log_path.exists():
+        log_path.unlink()
+    cache_dump(path, file_stamp(path, log_path), data, CACHE_KIND)
 
 def load_budgets():
     """Load budgets from JSON file."""
@@ -47,13 +84,10 @@ def load_budgets():
     if not path.exists():
         return {}
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return read_json(path)
     except (json.JSONDecodeError, FileNotFoundError):
         return {}
 
 def save_budgets(data):
     """Save budgets to JSON file."""
-    path = get_budget_path()
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4)
+    write_json(get_budget_path(), data)
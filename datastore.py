@@ -1,11 +1,32 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator, Tuple
 import json
+import heapq
+import atexit
 import sqlite3
+import threading
 import datetime
-import uuid
+import secrets
+import sys
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from config import get_data_path, get_budget_path, get_db_path
+from utils import read_json, write_json, write_atomic, append_bytes, json_loads, json_dumps, file_stamp, cache_load, cache_dump, timestamp_key
+
+# Optional streaming parser for filtered reads of large expense files
+try:
+    import ijson
+    HAS_ijson = True
+except ImportError:
+    HAS_ijson = False
+
+@lru_cache(maxsize=256)
+def normalize_category(category: str) -> str:
+    """Upper-case and intern a category name; the handful of distinct names repeat endlessly."""
+    return sys.intern(category.upper())
 
 class DataStore(ABC):
     @abstractmethod
@@ -40,96 +61,468 @@ class DataStore(ABC):
     def clear_all_expenses(self):
         pass
 
+    def snapshot(self, filters: Dict = None) -> Tuple[List[Dict], Dict]:
+        """Expenses (same filters as get_expenses) and budgets, read together."""
+        return self.get_expenses(filters), self.load_budgets()
+
+    def recent_expenses(self, limit: int) -> List[Dict]:
+        """The newest `limit` expenses, newest first."""
+        # Copies, as iter_expenses may hand out the store's own rows
+        return [dict(item) for item in heapq.nlargest(limit, self.iter_expenses(), key=itemgetter('timestamp'))]
+
+    def iter_expenses(self, filters: Dict = None) -> Iterator[Dict]:
+        """
+        Same rows as get_expenses, yielded one at a time. Backends override it
+        to avoid holding every row in memory, e.g. for large exports. The rows
+        may be the store's cached ones: treat them as read-only.
+        """
+        return iter(self.get_expenses(filters))
+
+    @staticmethod
+    def _day_bounds(day: datetime.date):
+        """Inclusive ISO timestamp bounds of a calendar day."""
+        return (
+            datetime.datetime.combine(day, datetime.time.min).isoformat(),
+            datetime.datetime.combine(day, datetime.time.max).isoformat(),
+        )
+
+    def day_total(self, day: datetime.date) -> float:
+        """Total amount spent on one calendar day."""
+        start, end = self._day_bounds(day)
+        return sum(map(itemgetter('amount'), self.iter_expenses({'start': start, 'end': end})))
+
+    def category_spend_since(self, category: str, start: str) -> float:
+        """Total spent in one category from an ISO timestamp onwards."""
+        return sum(map(itemgetter('amount'), self.iter_expenses({'start': start, 'category': category})))
+
+    def category_totals(self) -> Dict[str, float]:
+        """Total amount per category over all expenses."""
+        totals = defaultdict(float)
+        for item in self.iter_expenses():
+            totals[item['category']] += item['amount']
+        return dict(totals)
+
+    def category_totals_between(self, start: str = None, end: str = None) -> Dict[str, float]:
+        """Total amount per category between two ISO timestamps (inclusive, either may be open)."""
+        totals = defaultdict(float)
+        for item in self.iter_expenses({'start': start, 'end': end}):
+            totals[item['category']] += item['amount']
+        return dict(totals)
+
+    def add_expenses(self, rows: List[Dict]) -> List[Dict]:
+        """Add many expenses at once. Each row takes the same keys as add_expense."""
+        return [self.add_expense(**row) for row in rows]
+
+    def flush(self):
+        """Persist any buffered writes. Backends that write through can ignore this."""
+        pass
+
+    @contextmanager
+    def transaction(self):
+        """Group several writes so the backend can commit them together."""
+        yield
+
+def _in_range(item: Dict, start: Optional[str], end: Optional[str]) -> bool:
+    """
+    Whether a JSON row falls within inclusive ISO bounds. Rows go through
+    timestamp_key, so tz-aware and legacy 'date'-only rows compare correctly;
+    rows without a usable timestamp only match an unbounded range.
+    """
+    if not start and not end:
+        return True
+    key = timestamp_key(item.get('timestamp', item.get('date')))
+    if not key:
+        return False
+    return (not start or key >= start) and (not end or key <= end)
+
 class JSONDataStore(DataStore):
+    # Appended records are folded back into expenses.json once the log grows past this
+    COMPACT_THRESHOLD = 500
+
     def __init__(self):
         self.data_path = get_data_path()
         self.budget_path = get_budget_path()
+        # New expenses are appended here instead of rewriting the whole JSON file
+        self.log_path = self.data_path.with_suffix('.jsonl')
+        # Small precomputed views kept up to date on write, each tagged with
+        # the file state it matches: per-category totals, and today's total
+        self.totals_path = self.data_path.with_name('totals.json')
+        self.today_path = self.data_path.with_name('today.json')
+        self._cache: Optional[List[Dict]] = None
+        self._cache_state = None
+        self._log_count = 0
+        # Inside transaction(), writes only touch the cache until it exits
+        self._in_transaction = False
+        self._dirty = False
+        # Parsed budgets.json and the file stamp it was read at
+        self._budgets: Optional[Dict] = None
+        self._budgets_state = None
+
+    def _file_state(self):
+        """Fingerprint of the on-disk files, used to detect outside changes."""
+        return file_stamp(self.data_path, self.log_path)
+
+    def _cache_is_fresh(self) -> bool:
+        return self._cache is not None and self._file_state() == self._cache_state
+
+    def _load_cached(self, state) -> bool:
+        """Adopt the rows a previous command pickled for this exact state, if any."""
+        cached = cache_load(self.data_path, state)
+        if cached is None:
+            return False
+        self._cache, self._log_count = cached
+        self._cache_state = state
+        return True
 
     def _load_data(self) -> List[Dict]:
-        if not self.data_path.exists():
-            return []
-        try:
-            with open(self.data_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return []
+        state = self._file_state()
+        if self._cache is not None and state == self._cache_state:
+            return self._cache
+        if self._load_cached(state):
+            return self._cache
+
+        data = []
+        if self.data_path.exists():
+            try:
+                data = read_json(self.data_path)
+            except (json.JSONDecodeError, FileNotFoundError):
+                data = []
+
+        # Replay expenses appended since the last compaction
+        self._log_count = 0
+        if self.log_path.exists():
+            with open(self.log_path, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        data.append(json_loads(line))
+                        self._log_count += 1
+                    except json.JSONDecodeError:
+                        continue # Torn write from a crash, skip it
+
+        # Normalize once here (rows from older versions may not be upper-cased),
+        # so filters compare categories directly; also shares one string per name
+        for item in data:
+            category = item.get('category')
+            if category:
+                item['category'] = normalize_category(category)
+
+        self._cache = data
+        self._cache_state = state
+        cache_dump(self.data_path, state, (data, self._log_count))
+        return data
+
+    def _stream_data(self):
+        """Yield expenses one at a time from disk without building the full list."""
+        for item in self._stream_records():
+            # Same normalization _load_data applies
+            category = item.get('category')
+            if category:
+                item['category'] = normalize_category(category)
+            yield item
+
+    def _stream_records(self):
+        if self.data_path.exists():
+            try:
+                with open(self.data_path, 'rb') as f:
+                    yield from ijson.items(f, 'item', use_float=True)
+            except (ijson.JSONError, FileNotFoundError):
+                pass
+        if self.log_path.exists():
+            with open(self.log_path, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json_loads(line)
+                    except json.JSONDecodeError:
+                        continue
 
     def _save_data(self, data: List[Dict]):
-        with open(self.data_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
+        self._cache = data
+        if self._in_transaction:
+            self._dirty = True
+            return
+        self.flush()
 
-    def add_expense(self, amount: float, category: str, note: str, timestamp: str, expense_id: str = None) -> Dict:
-        data = self._load_data()
+    @contextmanager
+    def transaction(self):
+        """Apply the writes inside in memory, then rewrite expenses.json once."""
+        if self._in_transaction:
+            yield
+            return
+        self._in_transaction = True
+        try:
+            yield
+        except BaseException:
+            # Nothing reached disk yet: forget the in-memory changes instead
+            self._in_transaction = False
+            self._dirty = False
+            self._cache = None
+            self._cache_state = None
+            raise
+        self._in_transaction = False
+        if self._dirty:
+            self._dirty = False
+            self.flush()
+
+    def flush(self):
+        """Rewrite expenses.json from memory and drop the append log."""
+        if self._cache is None:
+            # Nothing loaded (or the cache was dropped): only fold in a pending log
+            if not self.log_path.exists():
+                return
+            self._load_data()
+        # Compact: indentation would roughly double the size and encode time
+        self._replace_data(json_dumps(self._cache, indent=False))
+
+    def _replace_data(self, payload: bytes):
+        """Atomically swap in a new expenses.json and drop the append log."""
+        write_atomic(self.data_path, payload)
+        if self.log_path.exists():
+            self.log_path.unlink()
+        self._log_count = 0
+        self._cache_state = self._file_state()
+        cache_dump(self.data_path, self._cache_state, (self._cache, 0))
+        self._write_view(self.totals_path, self._cache_state, {'totals': self._sum_by_category(self._cache)})
+        today = datetime.date.today()
+        start, end = self._day_bounds(today)
+        self._write_view(self.today_path, self._cache_state, {
+            'day': today.isoformat(),
+            'total': sum(item['amount'] for item in self._cache if _in_range(item, start, end)),
+        })
+
+    @staticmethod
+    def _sum_by_category(rows, totals: Dict = None) -> Dict[str, float]:
+        totals = defaultdict(float, totals or {})
+        for item in rows:
+            totals[item['category']] += item['amount']
+        return dict(totals)
+
+    def _read_view(self, path: Path, state) -> Optional[Dict]:
+        """A stored view, or None if missing, corrupt or written for other files."""
+        try:
+            view = read_json(path)
+            if view['state'] == json_loads(json_dumps(state, indent=False)):
+                return view
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            pass
+        return None
+
+    def _write_view(self, path: Path, state, view: Dict):
+        try:
+            write_atomic(path, json_dumps({**view, 'state': state}, indent=False))
+        except OSError:
+            pass # Only costs the next reader a rebuild
+
+    def _update_views(self, entries: List[Dict], old_state):
+        """Fold appended rows into the views that were current before the append."""
+        view = self._read_view(self.totals_path, old_state)
+        if view is not None:
+            view['totals'] = self._sum_by_category(entries, view['totals'])
+            self._write_view(self.totals_path, self._cache_state, view)
+
+        view = self._read_view(self.today_path, old_state)
+        if view is not None:
+            start, end = self._day_bounds(datetime.date.fromisoformat(view['day']))
+            view['total'] += sum(item['amount'] for item in entries if _in_range(item, start, end))
+            self._write_view(self.today_path, self._cache_state, view)
+
+    def category_totals(self) -> Dict[str, float]:
+        view = self._read_view(self.totals_path, self._file_state())
+        if view is not None:
+            return view['totals']
+        # Missing or stale (e.g. files changed by sync): rebuild in one pass
+        totals = self._sum_by_category(self._load_data())
+        self._write_view(self.totals_path, self._cache_state, {'totals': totals})
+        return totals
+
+    def day_total(self, day: datetime.date) -> float:
+        state = self._file_state()
+        view = self._read_view(self.today_path, state)
+        if view is not None and view['day'] == day.isoformat():
+            return view['total']
+        # Only one day is kept, so the first poll after midnight rebuilds it
+        total = super().day_total(day)
+        self._write_view(self.today_path, state, {'day': day.isoformat(), 'total': total})
+        return total
+
+    def _make_entry(self, amount: float, category: str, note: str, timestamp: str, expense_id: str = None) -> Dict:
         if not expense_id:
-            expense_id = str(uuid.uuid4())[:8]
+            expense_id = secrets.token_hex(4)
             
-        entry = {
+        return {
             "id": expense_id,
             "date": datetime.datetime.fromisoformat(timestamp).strftime("%Y-%m-%d %H:%M"),
             "timestamp": timestamp,
             "amount": amount,
-            "category": category.upper(),
+            "category": normalize_category(category),
             "note": note
         }
-        data.append(entry)
-        self._save_data(data)
+
+    def _append(self, entries: List[Dict]):
+        data = self._load_data()
+        data.extend(entries)
+
+        if self._in_transaction:
+            self._dirty = True
+        elif self._log_count + len(entries) > self.COMPACT_THRESHOLD:
+            self.flush()
+        else:
+            payload = b"".join(json_dumps(entry, indent=False) + b"\n" for entry in entries)
+            append_bytes(self.log_path, payload)
+            self._log_count += len(entries)
+            old_state, new_state = self._cache_state, self._file_state()
+            old_log_size = old_state[1][1] if old_state[1] else 0
+            if new_state[0] == old_state[0] and new_state[1][1] == old_log_size + len(payload):
+                self._cache_state = new_state
+                self._update_views(entries, old_state)
+            else:
+                # Another process wrote since we loaded: its rows aren't in the
+                # cache, so reread before anything (e.g. compaction) relies on it
+                self._cache = None
+                self._cache_state = None
+
+    def add_expense(self, amount: float, category: str, note: str, timestamp: str, expense_id: str = None) -> Dict:
+        entry = self._make_entry(amount, category, note, timestamp, expense_id)
+        self._append([entry])
         return entry
 
+    def add_expenses(self, rows: List[Dict]) -> List[Dict]:
+        entries = [self._make_entry(**row) for row in rows]
+        if entries:
+            self._append(entries)
+        return entries
+
     def get_expenses(self, filters: Dict = None) -> List[Dict]:
-        data = self._load_data()
-        # Filters can be applied here or by the caller. For now, we return all and let caller filter.
-        # But for SQL optimization, we'd want filters down here.
-        # Implemented for SQLite later.
-        return data
+        # Copies, so callers that modify rows can't change the cache (and
+        # with it the next rewrite of expenses.json)
+        if not filters:
+            return [dict(item) for item in self._load_data()]
+        return [dict(item) for item in self.iter_expenses(filters)]
+
+    def iter_expenses(self, filters: Dict = None) -> Iterator[Dict]:
+        if HAS_ijson and not self._cache_is_fresh() and not self._load_cached(self._file_state()):
+            # Nothing cached in memory or on disk: filter while parsing so
+            # only the matches are kept
+            data = self._stream_data()
+        else:
+            data = iter(self._load_data())
+        if not filters:
+            return data
+        # Same semantics as the SQLite backend: ISO string bounds and exact
+        # (normalized) category
+        start = filters.get('start')
+        end = filters.get('end')
+        category = normalize_category(filters.get('category') or '')
+        return (
+            item for item in data
+            if (not category or item.get('category') == category)
+            and _in_range(item, start, end)
+        )
 
     def get_expense(self, expense_id: str) -> Optional[Dict]:
         data = self._load_data()
         for item in data:
             if item['id'] == expense_id:
-                return item
+                return dict(item)
+        return None
+
+    def _find(self, expense_id: str) -> Optional[int]:
+        """Position of an expense in the loaded list."""
+        for i, item in enumerate(self._load_data()):
+            if item['id'] == expense_id:
+                return i
         return None
 
     def update_expense(self, expense_id: str, updates: Dict) -> bool:
+        i = self._find(expense_id)
+        if i is None:
+            return False
         data = self._load_data()
-        for i, item in enumerate(data):
-            if item['id'] == expense_id:
-                data[i].update(updates)
-                self._save_data(data)
-                return True
-        return False
+        if 'category' in updates:
+            updates = {**updates, 'category': normalize_category(updates['category'])}
+        data[i].update(updates)
+        self._save_data(data)
+        return True
 
     def delete_expense(self, expense_id: str) -> bool:
+        i = self._find(expense_id)
+        if i is None:
+            return False
+        # In place, rather than copying every other row into a new list
         data = self._load_data()
-        initial_len = len(data)
-        data = [item for item in data if item['id'] != expense_id]
-        if len(data) < initial_len:
-            self._save_data(data)
-            return True
-        return False
+        del data[i]
+        self._save_data(data)
+        return True
 
     def load_budgets(self) -> Dict:
-        if not self.budget_path.exists():
-            return {}
-        try:
-            with open(self.budget_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return {}
+        state = file_stamp(self.budget_path)
+        if self._budgets is None or state != self._budgets_state:
+            budgets = {}
+            if self.budget_path.exists():
+                try:
+                    budgets = read_json(self.budget_path)
+                except:
+                    budgets = {}
+            self._budgets, self._budgets_state = budgets, state
+        # Callers edit the result before saving it, so never hand out the cache
+        return {category: dict(info) for category, info in self._budgets.items()}
 
     def save_budgets(self, budgets: Dict):
-        with open(self.budget_path, 'w', encoding='utf-8') as f:
-            json.dump(budgets, f, indent=4)
+        write_json(self.budget_path, budgets)
+        self._budgets = {category: dict(info) for category, info in budgets.items()}
+        self._budgets_state = file_stamp(self.budget_path)
 
     def clear_all_expenses(self):
-        self._save_data([])
+        # Nothing to serialize, write the empty array directly
+        self._cache = []
+        self._replace_data(b"[]")
 
 class SQLiteDataStore(DataStore):
+    # Fixed column order so rows can be unpacked positionally
+    EXPENSE_COLUMNS = "id, amount, category, note, timestamp, date_display"
+    # Rows pulled per round trip by iter_expenses
+    FETCH_SIZE = 1000
+    # Distinct get_expenses queries whose rows are kept between calls
+    RESULT_CACHE_SIZE = 4
+
     def __init__(self):
         self.db_path = get_db_path()
+        # One long-lived connection in autocommit mode; batches use explicit transactions
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA mmap_size=268435456")
+        # ~20 MB page cache (negative means KiB)
+        self.conn.execute("PRAGMA cache_size=-20000")
+        # The connection is shared between threads: each thread gets its own
+        # cursor, and the lock keeps one thread's transaction from swallowing
+        # another thread's statements.
+        self._tls = threading.local()
+        self._lock = threading.RLock()
+        # get_expenses rows per (query, params) and the budgets dict, both
+        # valid while data_version is unchanged
+        self._results = {}
+        self._budgets: Optional[Dict] = None
+        self._data_version = None
         self._init_db()
+        # Close on exit so the WAL is checkpointed back into the database file
+        atexit.register(self.close)
 
     def _get_conn(self):
-        return sqlite3.connect(self.db_path)
+        return self.conn
+
+    def _cursor(self) -> sqlite3.Cursor:
+        cursor = getattr(self._tls, 'cursor', None)
+        if cursor is None:
+            cursor = self._tls.cursor = self.conn.cursor()
+        return cursor
+
+    def close(self):
+        self.conn.close()
 
     def _init_db(self):
         conn = self._get_conn()
@@ -146,6 +539,10 @@ class SQLiteDataStore(DataStore):
                 date_display TEXT
             )
         ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_expenses_timestamp ON expenses(timestamp)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_expenses_category ON expenses(category)")
+        # Budget checks read one category over a time range
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_expenses_category_timestamp ON expenses(category, timestamp)")
         
         # Budgets Table (Simplified Key-Value store for now to match JSON structure, or structured?)
         # Let's keep it structured but map to the Dict format expected by app
@@ -157,69 +554,194 @@ class SQLiteDataStore(DataStore):
                 created TEXT
             )
         ''')
-        
-        conn.commit()
-        conn.close()
 
-    def add_expense(self, amount: float, category: str, note: str, timestamp: str, expense_id: str = None) -> Dict:
+        # Databases from before categories were normalized on write get their
+        # rows fixed up once, so category filters stay exact, indexed compares
+        if conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+            with self.transaction():
+                for (category,) in conn.execute("SELECT DISTINCT category FROM expenses").fetchall():
+                    normalized = normalize_category(category)
+                    if normalized != category:
+                        conn.execute("UPDATE expenses SET category = ? WHERE category = ?", (normalized, category))
+                conn.execute("PRAGMA user_version = 1")
+
+    def _make_entry(self, amount: float, category: str, note: str, timestamp: str, expense_id: str = None) -> Dict:
         if not expense_id:
-            expense_id = str(uuid.uuid4())[:8]
+            expense_id = secrets.token_hex(4)
         date_display = datetime.datetime.fromisoformat(timestamp).strftime("%Y-%m-%d %H:%M")
         
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO expenses (id, amount, category, note, timestamp, date_display) VALUES (?, ?, ?, ?, ?, ?)",
-            (expense_id, amount, category.upper(), note, timestamp, date_display)
-        )
-        conn.commit()
-        conn.close()
-        
         return {
             "id": expense_id,
             "amount": amount,
-            "category": category.upper(),
+            "category": normalize_category(category),
             "note": note,
             "timestamp": timestamp,
             "date": date_display
         }
 
+    def add_expense(self, amount: float, category: str, note: str, timestamp: str, expense_id: str = None) -> Dict:
+        return self.add_expenses([{
+            "amount": amount,
+            "category": category,
+            "note": note,
+            "timestamp": timestamp,
+            "expense_id": expense_id,
+        }])[0]
+
+    def add_expenses(self, rows: List[Dict]) -> List[Dict]:
+        entries = [self._make_entry(**row) for row in rows]
+        # One transaction for the whole batch instead of a commit per row
+        with self.transaction():
+            self._results.clear()
+            self._cursor().executemany(
+                "INSERT INTO expenses (id, amount, category, note, timestamp, date_display) VALUES (?, ?, ?, ?, ?, ?)",
+                ((e["id"], e["amount"], e["category"], e["note"], e["timestamp"], e["date"]) for e in entries)
+            )
+        return entries
+
+    @contextmanager
+    def transaction(self):
+        """One write transaction around the block; nested uses join the outer one."""
+        with self._lock:
+            if self.conn.in_transaction:
+                yield
+                return
+            cursor = self._cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                # Rows read inside the transaction may be gone now
+                self._results.clear()
+                self._budgets = None
+                raise
+            cursor.execute("COMMIT")
+
+    @staticmethod
+    def _row_to_expense(row) -> Dict:
+        id_, amount, category, note, timestamp, date_display = row
+        return {
+            "id": id_,
+            "amount": amount,
+            "category": sys.intern(category),
+            "note": note,
+            "timestamp": timestamp,
+            "date_display": date_display,
+            "date": date_display
+        }
+
     def get_expenses(self, filters: Dict = None) -> List[Dict]:
-        conn = self._get_conn()
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM expenses")
-        rows = cursor.fetchall()
-        conn.close()
-        
-        result = []
-        for row in rows:
-            item = dict(row)
-            if 'date_display' in item:
-                item['date'] = item['date_display']
-            result.append(item)
-        
-        return result
+        """
+        Fetch expenses, optionally narrowed down in SQL.
+        Supported filters: 'start' / 'end' (ISO timestamps, inclusive) and 'category'.
+        """
+        query, params = self._select_expenses(filters)
+        key = (query, tuple(params))
+        with self._lock:
+            cursor = self._cursor()
+            self._check_data_version(cursor)
+            rows = self._results.get(key)
+            if rows is None:
+                rows = cursor.execute(query, params).fetchall()
+                if len(self._results) >= self.RESULT_CACHE_SIZE:
+                    del self._results[next(iter(self._results))]
+                self._results[key] = rows
+        # Fresh dicts every call, so callers may modify them
+        return [self._row_to_expense(row) for row in rows]
+
+    def iter_expenses(self, filters: Dict = None) -> Iterator[Dict]:
+        """Like get_expenses, but fetches FETCH_SIZE rows at a time."""
+        query, params = self._select_expenses(filters)
+        with self._lock:
+            # A cursor of its own, so other statements can run between batches
+            cursor = self.conn.execute(query, params)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(self.FETCH_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                yield self._row_to_expense(row)
+
+    def snapshot(self, filters: Dict = None) -> Tuple[List[Dict], Dict]:
+        # One read transaction, so the budgets match the expenses they're compared to
+        with self._lock:
+            cursor = self._cursor()
+            cursor.execute("BEGIN")
+            try:
+                return self.get_expenses(filters), self.load_budgets()
+            finally:
+                cursor.execute("COMMIT")
+
+    def recent_expenses(self, limit: int) -> List[Dict]:
+        # Walks the timestamp index backwards and stops after `limit` rows
+        query = f"SELECT {self.EXPENSE_COLUMNS} FROM expenses ORDER BY timestamp DESC LIMIT ?"
+        with self._lock:
+            rows = self._cursor().execute(query, (limit,)).fetchall()
+        return [self._row_to_expense(row) for row in rows]
+
+    def category_spend_since(self, category: str, start: str) -> float:
+        with self._lock:
+            (total,) = self._cursor().execute(
+                "SELECT COALESCE(SUM(amount), 0) FROM expenses WHERE category = ? AND timestamp >= ?",
+                (normalize_category(category), start),
+            ).fetchone()
+        return total
+
+    def category_totals(self) -> Dict[str, float]:
+        with self._lock:
+            rows = self._cursor().execute(
+                "SELECT category, SUM(amount) FROM expenses GROUP BY category"
+            ).fetchall()
+        return dict(rows)
+
+    def category_totals_between(self, start: str = None, end: str = None) -> Dict[str, float]:
+        where, params = self._where({'start': start, 'end': end})
+        with self._lock:
+            rows = self._cursor().execute(
+                f"SELECT category, SUM(amount) FROM expenses{where} GROUP BY category", params
+            ).fetchall()
+        return dict(rows)
+
+    def _select_expenses(self, filters: Dict = None):
+        where, params = self._where(filters)
+        return f"SELECT {self.EXPENSE_COLUMNS} FROM expenses{where}", params
+
+    def _where(self, filters: Dict = None):
+        """WHERE clause (with leading space, or empty) and parameters for a filters dict."""
+        clauses = []
+        params = []
+        if filters:
+            if filters.get('start'):
+                clauses.append("timestamp >= ?")
+                params.append(filters['start'])
+            if filters.get('end'):
+                clauses.append("timestamp <= ?")
+                params.append(filters['end'])
+            if filters.get('category'):
+                clauses.append("category = ?")
+                params.append(normalize_category(filters['category']))
+        if not clauses:
+            return "", params
+        return " WHERE " + " AND ".join(clauses), params
 
     def get_expense(self, expense_id: str) -> Optional[Dict]:
-        conn = self._get_conn()
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM expenses WHERE id = ?", (expense_id,))
-        row = cursor.fetchone()
-        conn.close()
+        with self._lock:
+            row = self._cursor().execute(
+                f"SELECT {self.EXPENSE_COLUMNS} FROM expenses WHERE id = ?", (expense_id,)
+            ).fetchone()
         
         if row:
-            item = dict(row)
-            if 'date_display' in item:
-                item['date'] = item['date_display']
-            return item
+            return self._row_to_expense(row)
         return None
 
     def update_expense(self, expense_id: str, updates: Dict) -> bool:
         # Construct query dynamically
         if not updates:
             return False
+        if 'category' in updates:
+            updates = {**updates, 'category': normalize_category(updates['category'])}
             
         fields = []
         values = []
@@ -230,75 +752,77 @@ class SQLiteDataStore(DataStore):
         
         values.append(expense_id)
         
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute(f"UPDATE expenses SET {', '.join(fields)} WHERE id = ?", values)
-        affected = cursor.rowcount
-        conn.commit()
-        conn.close()
-        return affected > 0
+        with self._lock:
+            self._results.clear()
+            cursor = self._cursor()
+            cursor.execute(f"UPDATE expenses SET {', '.join(fields)} WHERE id = ?", values)
+            return cursor.rowcount > 0
 
     def delete_expense(self, expense_id: str) -> bool:
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
-        affected = cursor.rowcount
-        conn.commit()
-        conn.close()
-        return affected > 0
+        with self._lock:
+            self._results.clear()
+            cursor = self._cursor()
+            cursor.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
+            return cursor.rowcount > 0
+
+    def _check_data_version(self, cursor: sqlite3.Cursor):
+        """Drop cached reads if another connection committed since; our own writes clear them directly."""
+        (version,) = cursor.execute("PRAGMA data_version").fetchone()
+        if version != self._data_version:
+            self._results.clear()
+            self._budgets = None
+            self._data_version = version
 
     def load_budgets(self) -> Dict:
-        conn = self._get_conn()
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM budgets")
-        rows = cursor.fetchall()
-        conn.close()
-        
-        budgets = {}
-        for row in rows:
-            budgets[row['category']] = {
-                "amount": row['amount'],
-                "period": row['period'],
-                "created": row['created']
-            }
-        return budgets
+        with self._lock:
+            cursor = self._cursor()
+            self._check_data_version(cursor)
+            if self._budgets is None:
+                rows = cursor.execute("SELECT category, amount, period, created FROM budgets").fetchall()
+                budgets = {}
+                for category, amount, period, created in rows:
+                    budgets[category] = {
+                        "amount": amount,
+                        "period": period,
+                        "created": created
+                    }
+                self._budgets = budgets
+            budgets = self._budgets
+        # Callers edit the result before saving it, so never hand out the cache
+        return {category: dict(info) for category, info in budgets.items()}
 
     def save_budgets(self, budgets: Dict):
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        
-        # Full replace strategy for simplicity to match JSON behavior
-        cursor.execute("DELETE FROM budgets")
-        
-        for cat, info in budgets.items():
-            cursor.execute(
+        with self.transaction():
+            self._budgets = None
+            cursor = self._cursor()
+            # Full replace strategy for simplicity to match JSON behavior
+            cursor.execute("DELETE FROM budgets")
+            cursor.executemany(
                 "INSERT INTO budgets (category, amount, period, created) VALUES (?, ?, ?, ?)",
-                (cat, info['amount'], info['period'], info.get('created', ''))
+                [(cat, info['amount'], info['period'], info.get('created', '')) for cat, info in budgets.items()]
             )
-            
-        conn.commit()
-        conn.close()
 
     def clear_all_expenses(self):
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM expenses")
-        conn.commit()
-        conn.close()
+        with self._lock:
+            self._results.clear()
+            self._cursor().execute("DELETE FROM expenses")
 
 class DataStoreFactory:
     _instance = None
+    _lock = threading.Lock()
     
     @staticmethod
     def get_store() -> DataStore:
         if DataStoreFactory._instance is None:
-            # Check config (mocked for now, need to read from a real config or file)
-            # For now, default to JSON unless we see a config file saying otherwise
-            from config import STORAGE_BACKEND
-            
-            if STORAGE_BACKEND == "sqlite":
-                DataStoreFactory._instance = SQLiteDataStore()
-            else:
-                DataStoreFactory._instance = JSONDataStore()
+            with DataStoreFactory._lock:
+                # Re-check now that we hold the lock, another thread may have won
+                if DataStoreFactory._instance is None:
+                    # Check config (mocked for now, need to read from a real config or file)
+                    # For now, default to JSON unless we see a config file saying otherwise
+                    from config import STORAGE_BACKEND
+                    
+                    if STORAGE_BACKEND == "sqlite":
+                        DataStoreFactory._instance = SQLiteDataStore()
+                    else:
+                        DataStoreFactory._instance = JSONDataStore()
         return DataStoreFactory._instance
@@ -1,21 +1,38 @@
-from typing import List, Dict, Any
+import math
+from typing import List, Dict, Any, Tuple
+from collections import defaultdict
 from datetime import datetime, timedelta
 
 class DuplicateDetector:
     def __init__(self, existing_transactions: List[Dict]):
         self.existing = existing_transactions
+        # Bucket existing rows by (amount in cents, day) so is_duplicate only
+        # looks at a handful of candidates instead of scanning everything.
+        # Notes are upper-cased and timestamps parsed once, here.
+        self._index: Dict[Tuple[int, int], List[tuple]] = defaultdict(list)
+        for exist in existing_transactions:
+            e_amt = exist.get('amount')
+            if e_amt is None:
+                continue
+            try:
+                e_date = datetime.fromisoformat(exist.get('timestamp'))
+            except:
+                continue # Rows without a valid timestamp can never match
+            e_note = (exist.get('note') or '').upper()
+            key = (math.floor(e_amt * 100), e_date.toordinal())
+            self._index[key].append((e_amt, e_note, e_date))
 
     def is_duplicate(self, transaction: Any, tolerance_days: int = 1) -> bool:
         """
         Check if a transaction (likely an importer Transaction object or dict)
         is already in the existing data.
-        
+
         Criteria:
         1. Same Amount (exact float match)
         2. Same Description (or very close)
         3. Date within tolerance
         """
-        
+
         # Normalize incoming transaction data
         if hasattr(transaction, 'amount'):
             amt = transaction.amount
@@ -33,30 +50,32 @@ class DuplicateDetector:
              # Fallback parsing logic identical to base importer needed if not ISO
              return False # Can't compare dates safely
 
-        for exist in self.existing:
-            # Check Amount
-            e_amt = exist.get('amount')
-            if abs(e_amt - amt) > 0.01: # Float tolerance
-                continue
-                
-            # Check Description
-            # Simple inclusion checks or string equality
-            # Existing uses 'note' usually? Or we store raw 'description' separately?
-            # dot-spend currently uses 'note' for description.
-            e_note = exist.get('note', '').upper()
-            if desc.upper() not in e_note and e_note not in desc.upper():
-                 # Maybe edit distance check later? For now, strict-ish match.
-                 # If descriptions are totally different, probably not same tx.
-                 continue
-
-            # Check Date
-            # Existing data has 'timestamp' (ISO)
-            try:
-                e_date = datetime.fromisoformat(exist.get('timestamp'))
-                delta = abs((e_date - target_date).days)
-                if delta <= tolerance_days:
-                    return True
-            except:
-                continue
-                
+        desc_upper = desc.upper()
+        cents = math.floor(amt * 100)
+        day = target_date.toordinal()
+
+        # Neighbouring cents cover the float tolerance; the extra day covers
+        # timedelta.days flooring partial days.
+        for d_cents in (-1, 0, 1):
+            for d_day in range(-tolerance_days - 1, tolerance_days + 2):
+                for e_amt, e_note, e_date in self._index.get((cents + d_cents, day + d_day), ()):
+                    # Check Amount
+                    if abs(e_amt - amt) > 0.01: # Float tolerance
+                        continue
+
+                    # Check Description
+                    # Simple inclusion checks or string equality
+                    # dot-spend currently uses 'note' for description.
+                    if desc_upper not in e_note and e_note not in desc_upper:
+                        # Maybe edit distance check later? For now, strict-ish match.
+                        continue
+
+                    # Check Date
+                    try:
+                        delta = abs((e_date - target_date).days)
+                        if delta <= tolerance_days:
+                            return True
+                    except:
+                        continue # e.g. mixing naive and aware datetimes
+
         return False
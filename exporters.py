@@ -1,33 +1,64 @@
 import json
 import csv
+import importlib.util
+from contextlib import nullcontext
+from itertools import islice, chain
 import pandas as pd
 from pathlib import Path
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich import print as rprint
-import matplotlib.pyplot as plt
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet
 from io import BytesIO
+from utils import HAS_orjson
+
+if HAS_orjson:
+    import orjson
+
+# Heavy, format-specific libraries (matplotlib, reportlab, openpyxl and the
+# optional writers below) are imported inside the export that needs them, so
+# loading this module stays cheap.
+
+# Optional streaming xlsx writer, much faster than openpyxl on large exports
+HAS_pyexcelerate = importlib.util.find_spec("pyexcelerate") is not None
+
+# Optional multi-threaded CSV writer
+HAS_polars = importlib.util.find_spec("polars") is not None
+
+def _json_default(obj):
+    """orjson hook for the pandas values it doesn't know natively."""
+    if obj is pd.NaT:
+        return None
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
 
 class ExportManager:
+    # Big PDF tables are split up; ReportLab lays out one huge Table super-linearly
+    ROWS_PER_TABLE = 500
+    # Smaller exports finish before a spinner is worth its thread and redraws
+    SPINNER_MIN_ROWS = 5_000
+    # Write buffer for streamed CSV exports
+    STREAM_BUFFER_SIZE = 1 << 20
+    COLUMN_ORDER = ["id", "date", "category", "note", "amount"]
+
     def __init__(self, data):
         self.data = data
-        self.df = pd.DataFrame(data)
+        # Callers that already hold a DataFrame skip the rebuild
+        self.df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
         # Ensure consistent columns
         if not self.df.empty:
             # Reorder if possible
-            cols = ["id", "date", "category", "note", "amount"]
-            existing = [c for c in cols if c in self.df.columns]
-            start_cols = existing
-            other_cols = [c for c in self.df.columns if c not in cols and c != "timestamp"]
-            self.df = self.df[start_cols + other_cols]
+            self.df = self.df[self._order_columns(self.df.columns)]
+        # Column selections per 'fields' value, shared by every export
+        self._filter_cache = {}
+        self._category_cache = {}
 
-    def export(self, format: str, path: str, **kwargs):
-        """
-        Dispatch export to specific methods.
-        """
+    @classmethod
+    def _order_columns(cls, columns) -> list:
+        start_cols = [c for c in cls.COLUMN_ORDER if c in columns]
+        other_cols = [c for c in columns if c not in cls.COLUMN_ORDER and c != "timestamp"]
+        return start_cols + other_cols
+
+    @staticmethod
+    def _target_path(format: str, path: str) -> Path:
         target_path = Path(path)
         if target_path.is_dir():
              # Auto-generate filename
@@ -38,13 +69,27 @@ class ExportManager:
         # Create parent dir if needed
         if not target_path.parent.exists():
             target_path.parent.mkdir(parents=True, exist_ok=True)
+        return target_path
 
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            transient=True
-        ) as progress:
-            progress.add_task(description=f"Exporting to {format.upper()}...", total=None)
+    def export(self, format: str, path: str, **kwargs):
+        """
+        Dispatch export to specific methods.
+        """
+        target_path = self._target_path(format, path)
+
+        if format == "pdf" or len(self.df) > self.SPINNER_MIN_ROWS:
+            from rich.progress import Progress, SpinnerColumn, TextColumn
+            progress_ctx = Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                transient=True
+            )
+        else:
+            progress_ctx = nullcontext()
+
+        with progress_ctx as progress:
+            if progress is not None:
+                progress.add_task(description=f"Exporting to {format.upper()}...", total=None)
             
             try:
                 if format == "csv":
@@ -65,6 +110,18 @@ class ExportManager:
                 return None
 
     def _filter_fields(self, fields: str = None):
+        if fields not in self._filter_cache:
+            self._filter_cache[fields] = self._compute_filter(fields)
+        return self._filter_cache[fields]
+
+    def _category_totals(self, fields: str = None) -> pd.Series:
+        """Amount per category for a field selection, shared by the Excel and PDF exports."""
+        if fields not in self._category_cache:
+            df = self._filter_fields(fields)
+            self._category_cache[fields] = df.groupby("category")["amount"].sum()
+        return self._category_cache[fields]
+
+    def _compute_filter(self, fields: str = None):
         if fields:
             # Check validity
             req_fields = [f.strip() for f in fields.split(",")]
@@ -74,66 +131,165 @@ class ExportManager:
 
     def _export_csv(self, path: Path, delimiter: str = ",", fields: str = None, **kwargs):
         df = self._filter_fields(fields)
-        
-        # Add summary row?
-        # Pandas to_csv doesn't natively do summary footer easily without appending
-        # We can append a summary row to the DF temporarily
+        self._write_csv_frame(df, path, delimiter)
+
+        # The summary footer is appended to the written file with csv.writer;
+        # concatenating it onto the frame first copied every row and turned
+        # numeric columns into mixed objects
         if not df.empty and "amount" in df.columns:
-            total = df["amount"].sum()
-            avg = df["amount"].mean()
-            count = len(df)
-            
-            # Create summary series
-            summary = {c: "" for c in df.columns}
-            if "id" in df.columns: summary["id"] = "TOTAL"
-            if "category" in df.columns: summary["category"] = f"Count: {count}"
-            if "amount" in df.columns: summary["amount"] = total
-            
-            # Use pd.concat instead of append (deprecated)
-            summary_df = pd.DataFrame([summary])
-            df = pd.concat([df, summary_df], ignore_index=True)
-            
-        df.to_csv(path, index=False, sep=delimiter)
+            footer = self._csv_footer(df.columns, len(df), df["amount"].sum())
+            with open(path, 'a', newline='', encoding='utf-8') as f:
+                csv.writer(f, delimiter=delimiter, lineterminator="\n").writerow(footer)
+
+    @staticmethod
+    def _csv_footer(columns, count: int, total: float) -> list:
+        """The TOTAL row closing both CSV writers, one value per column."""
+        summary = {c: "" for c in columns}
+        if "id" in columns: summary["id"] = "TOTAL"
+        if "category" in columns: summary["category"] = f"Count: {count}"
+        summary["amount"] = total
+        return list(summary.values())
+
+    @classmethod
+    def stream_csv(cls, rows, path: str, delimiter: str = ",", fields: str = None):
+        """
+        Write expenses to CSV as they come in, without building a DataFrame, so
+        memory stays flat for any number of rows. Columns follow the first row
+        and the output matches the regular CSV export, footer included.
+        This is the CSV writer the CLI uses; export("csv") is kept for callers
+        that already hold the data as a DataFrame.
+        Returns the written path, or None if rows was empty or writing failed.
+        """
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return None
+
+        columns = cls._order_columns(list(first))
+        if fields:
+            req_fields = [f.strip() for f in fields.split(",")]
+            columns = [f for f in req_fields if f in columns]
+        amount_index = columns.index("amount") if "amount" in columns else None
+
+        target_path = cls._target_path("csv", path)
+        total = 0.0
+        count = 0
+        try:
+            with open(target_path, 'w', newline='', encoding='utf-8', buffering=cls.STREAM_BUFFER_SIZE) as f:
+                writer = csv.writer(f, delimiter=delimiter, lineterminator="\n")
+                writer.writerow(columns)
+                for row in chain((first,), rows):
+                    values = [row.get(c) for c in columns]
+                    if amount_index is not None and values[amount_index] is not None:
+                        # Float like the DataFrame column, even for amounts stored as ints;
+                        # a missing amount stays an empty cell and, like NaN, is left out of the total
+                        amount = values[amount_index] = float(values[amount_index])
+                        total += amount
+                    writer.writerow(values)
+                    count += 1
+
+                if amount_index is not None:
+                    writer.writerow(cls._csv_footer(columns, count, total))
+        except Exception as e:
+            # Don't leave a partial file looking like a finished export
+            target_path.unlink(missing_ok=True)
+            rprint(f"[bold red]✘ Export failed:[/bold red] {e}")
+            return None
+
+        rprint(f"[bold green]✔ Export successful:[/bold green] {target_path}")
+        return target_path
+
+    def _write_csv_frame(self, df: pd.DataFrame, path: Path, delimiter: str):
+        if HAS_polars:
+            import polars as pl
+            try:
+                # polars only takes a single-character separator
+                pl.from_pandas(df).write_csv(str(path), separator=delimiter)
+                return
+            except Exception:
+                pass # e.g. mixed-type columns polars can't convert, pandas copes
+        df.to_csv(path, index=False, sep=delimiter, lineterminator="\n")
+
+    def _column_widths(self, df: pd.DataFrame):
+        """Width per column from its longest rendered value, measured on the frame itself."""
+        widths = []
+        for col in df.columns:
+            longest = df[col].astype(str).str.len().max() if not df.empty else 0
+            widths.append(max(len(str(col)), int(longest)) + 2)
+        return widths
 
     def _export_excel(self, path: Path, fields: str = None, **kwargs):
+        from openpyxl.utils import get_column_letter
+
         df = self._filter_fields(fields)
+        widths = self._column_widths(df)
+
+        summary = None
+        if not df.empty and "category" in df.columns and "amount" in df.columns:
+            summary = self._category_totals(fields).reset_index()
+
+        if HAS_pyexcelerate:
+            self._export_excel_fast(path, df, widths, summary)
+            return
         
         with pd.ExcelWriter(path, engine='openpyxl') as writer:
             df.to_excel(writer, sheet_name='Expenses', index=False)
             
             # Access workbook for styling
-            workbook = writer.book
             worksheet = writer.sheets['Expenses']
             
             # Auto-adjust columns
-            for column in worksheet.columns:
-                max_length = 0
-                column = [cell for cell in column]
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = (max_length + 2)
-                worksheet.column_dimensions[column[0].column_letter].width = adjusted_width
+            for i, width in enumerate(widths, start=1):
+                worksheet.column_dimensions[get_column_letter(i)].width = width
                 
             # Freeze header
             worksheet.freeze_panes = worksheet['A2']
             
             # Summary Sheet
-            if not df.empty and "category" in df.columns and "amount" in df.columns:
-                summary = df.groupby("category")["amount"].sum().reset_index()
+            if summary is not None:
                 summary.to_excel(writer, sheet_name='Summary', index=False)
 
+    def _export_excel_fast(self, path: Path, df: pd.DataFrame, widths, summary):
+        """Same workbook layout as the openpyxl path, written in bulk by pyexcelerate."""
+        from pyexcelerate import Workbook, Style, Panes
+
+        def rows(frame):
+            # pyexcelerate wants plain Python values with None for blanks
+            values = frame.astype(object).where(frame.notna(), None)
+            return [frame.columns.tolist()] + values.values.tolist()
+
+        workbook = Workbook()
+        worksheet = workbook.new_sheet('Expenses', data=rows(df))
+        for i, width in enumerate(widths, start=1):
+            worksheet.set_col_style(i, Style(size=width))
+        worksheet.panes = Panes(0, 1)
+
+        if summary is not None:
+            workbook.new_sheet('Summary', data=rows(summary))
+        workbook.save(str(path))
+
 
     def _export_json(self, path: Path, fields: str = None, **kwargs):
         df = self._filter_fields(fields)
+        if HAS_orjson:
+            records = df.to_dict(orient="records")
+            path.write_bytes(orjson.dumps(
+                records, default=_json_default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+            ))
+            return
         # Standard json export
         df.to_json(path, orient="records", indent=4, date_format="iso")
 
     def _export_pdf(self, path: Path, template: str = "simple", fields: str = None, **kwargs):
         # Using ReportLab
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.platypus import SimpleDocTemplate, LongTable, TableStyle, Paragraph, Spacer, Image
+        from reportlab.lib.styles import getSampleStyleSheet
+
         doc = SimpleDocTemplate(str(path), pagesize=letter)
         elements = []
         styles = getSampleStyleSheet()
@@ -145,8 +301,9 @@ class ExportManager:
         
         # Summary stats
         if not self.df.empty:
-            total = self.df["amount"].sum()
-            count = len(self.df)
+            amounts = self.df["amount"]
+            total = amounts.sum()
+            count = len(amounts)
             summary_text = f"<b>Total Spent:</b> ${total:.2f} <br/> <b>Count:</b> {count} transactions"
             elements.append(Paragraph(summary_text, styles['Normal']))
             elements.append(Spacer(1, 24))
@@ -154,16 +311,17 @@ class ExportManager:
             # Chart
             if template == "detailed":
                 # Generate pie chart
-                cat_sum = self.df.groupby("category")["amount"].sum()
+                cat_sum = self._category_totals()
                 if not cat_sum.empty:
-                    plt.figure(figsize=(6, 4))
-                    plt.pie(cat_sum, labels=cat_sum.index, autopct='%1.1f%%')
-                    plt.title("Spending by Category")
+                    # Plain Figure + Agg canvas: no pyplot global state to set up or close
+                    fig = Figure(figsize=(6, 4))
+                    ax = fig.subplots()
+                    ax.pie(cat_sum.values, labels=cat_sum.index, autopct='%1.1f%%')
+                    ax.set_title("Spending by Category")
                     
                     img_buffer = BytesIO()
-                    plt.savefig(img_buffer, format='png')
+                    FigureCanvasAgg(fig).print_png(img_buffer)
                     img_buffer.seek(0)
-                    plt.close()
                     
                     im = Image(img_buffer, width=400, height=300)
                     elements.append(im)
@@ -171,12 +329,14 @@ class ExportManager:
 
         # Table
         df = self._filter_fields(fields)
-        # Convert to list of lists including header
         if not df.empty:
-            data = [df.columns.tolist()] + df.values.tolist()
+            # Format amounts up front so ReportLab only handles strings
+            if "amount" in df.columns:
+                df = df.assign(amount=df["amount"].map('{:.2f}'.format))
+            header = df.columns.tolist()
+            rows = df.itertuples(index=False, name=None)
             
             # Basic Table Styling
-            table = Table(data)
             style = TableStyle([
                 ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
                 ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
@@ -186,8 +346,13 @@ class ExportManager:
                 ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
                 ('GRID', (0, 0), (-1, -1), 1, colors.black)
             ])
-            table.setStyle(style)
-            elements.append(table)
+            while True:
+                chunk = list(islice(rows, self.ROWS_PER_TABLE))
+                if not chunk:
+                    break
+                table = LongTable([header] + chunk, repeatRows=1)
+                table.setStyle(style)
+                elements.append(table)
         else:
              elements.append(Paragraph("No data available.", styles['Normal']))
             
@@ -1,23 +1,63 @@
+import os
 import json
 import datetime
+from collections import deque
 from pathlib import Path
 from config import get_history_path
+from utils import read_json, json_loads, json_dumps, write_atomic, append_bytes
 
 class HistoryManager:
+    # The log may grow this far past max_history before it is trimmed
+    COMPACT_FACTOR = 1.5
+    # How far back pop_last_transaction reads per step looking for a newline
+    TAIL_CHUNK = 4096
+
     def __init__(self):
+        # One JSON object per line: logging is an append, not a rewrite
         self.path = get_history_path()
+        self.legacy_path = self.path.with_suffix('.json')
         self.max_history = 1000
+        self._line_count = None
 
-    def _load(self):
+    def _migrate_legacy(self):
+        """Fold a history.json from older versions into the log, once."""
+        if not self.legacy_path.exists():
+            return
         try:
-            with open(self.path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            transactions = read_json(self.legacy_path).get("transactions", [])
         except (FileNotFoundError, json.JSONDecodeError):
-            return {"transactions": []}
+            transactions = []
+        self._rewrite((transactions + self._read_all())[-self.max_history:])
+        self.legacy_path.unlink()
+
+    def _read_lines(self):
+        try:
+            with open(self.path, 'rb') as f:
+                return [line for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def _parse(self, lines):
+        transactions = []
+        for line in lines:
+            try:
+                transactions.append(json_loads(line))
+            except json.JSONDecodeError:
+                continue # Torn write from a crash, skip it
+        return transactions
 
-    def _save(self, data):
-        with open(self.path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
+    def _read_all(self):
+        return self._parse(self._read_lines())
+
+    def _rewrite(self, transactions):
+        write_atomic(self.path, b"".join(json_dumps(tx, indent=False) + b"\n" for tx in transactions))
+        self._line_count = len(transactions)
+
+    def _count_lines(self) -> int:
+        if self._line_count is None:
+            self._migrate_legacy()
+            self._line_count = len(self._read_lines())
+        return self._line_count
 
     def log_transaction(self, action: str, expense_id: str, before: dict = None, after: dict = None, expense: dict = None):
         """
@@ -28,39 +68,93 @@ class HistoryManager:
         after: State after change (for edit)
         expense: The full expense object (for add/delete context)
         """
-        data = self._load()
-        
-        transaction = {
-            "timestamp": datetime.datetime.now().isoformat(),
-            "action": action,
-            "expense_id": expense_id,
-        }
-        
-        if before: transaction["before"] = before
-        if after: transaction["after"] = after
-        if expense: transaction["expense"] = expense
-        
-        data["transactions"].append(transaction)
-        
-        # Enforce limit
-        if len(data["transactions"]) > self.max_history:
-            data["transactions"] = data["transactions"][-self.max_history:]
-            
-        self._save(data)
+        self.log_transactions([
+            {"action": action, "expense_id": expense_id, "before": before, "after": after, "expense": expense}
+        ])
+
+    def log_transactions(self, entries: list):
+        """
+        Log several transactions with one append, e.g. a whole import.
+        Each entry is a dict of log_transaction's arguments.
+        """
+        if not entries:
+            return
+        count = self._count_lines()
+        timestamp = datetime.datetime.now().isoformat()
+
+        lines = []
+        for entry in entries:
+            transaction = {
+                "timestamp": timestamp,
+                "action": entry["action"],
+                "expense_id": entry["expense_id"],
+            }
+            for key in ("before", "after", "expense"):
+                if entry.get(key): transaction[key] = entry[key]
+            lines.append(json_dumps(transaction, indent=False) + b"\n")
+
+        append_bytes(self.path, b"".join(lines))
+        self._line_count = count + len(lines)
+
+        # Enforce limit lazily so most calls stay a single append
+        if self._line_count > self.max_history * self.COMPACT_FACTOR:
+            self._rewrite(self._read_all()[-self.max_history:])
 
     def pop_last_transaction(self):
         """Removes and returns the last transaction."""
-        data = self._load()
-        if not data["transactions"]:
+        self._count_lines()
+        try:
+            f = open(self.path, 'r+b')
+        except FileNotFoundError:
             return None
-        
-        last = data["transactions"].pop()
-        self._save(data)
-        return last
+
+        with f:
+            end = f.seek(0, os.SEEK_END)
+            while end > 0:
+                # Walk back in chunks to the newline that starts the last line
+                f.seek(end - 1)
+                if f.read(1) == b"\n":
+                    end -= 1
+                    continue
+                start = end
+                while start > 0:
+                    step = min(self.TAIL_CHUNK, start)
+                    f.seek(start - step)
+                    chunk = f.read(step)
+                    newline = chunk.rfind(b"\n")
+                    if newline != -1:
+                        start = start - step + newline + 1
+                        break
+                    start -= step
+                f.seek(start)
+                line = f.read(end - start)
+                f.truncate(start)
+                end = start
+                if self._line_count:
+                    self._line_count -= 1
+                try:
+                    return json_loads(line)
+                except json.JSONDecodeError:
+                    continue # Torn write, drop it and try the line before
+        return None
+
+    def push_back(self, transactions: list):
+        """Re-append transactions taken off by pop_last_transaction, oldest first."""
+        if not transactions:
+            return
+        count = self._count_lines()
+        append_bytes(self.path, b"".join(json_dumps(tx, indent=False) + b"\n" for tx in transactions))
+        self._line_count = count + len(transactions)
 
     def get_history(self, limit=20):
-        data = self._load()
-        return data["transactions"][-limit:]
+        self._count_lines()
+        try:
+            with open(self.path, 'rb') as f:
+                tail = deque((line for line in f if line.strip()), maxlen=limit)
+        except FileNotFoundError:
+            return []
+        return self._parse(tail)
 
     def clear_history(self):
-        self._save({"transactions": []})
+        self.legacy_path.unlink(missing_ok=True)
+        self._rewrite([])
@@ -1,9 +1,12 @@
+import numpy as np
+import pandas as pd
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any
 from dataclasses import dataclass
 from datetime import datetime
 
-@dataclass
+# Slotted: big imports create one of these per statement row
+@dataclass(slots=True)
 class Transaction:
     date: str  # ISO format YYYY-MM-DD (or with time)
     amount: float
@@ -13,12 +16,38 @@ class Transaction:
     source: str = "" # e.g. "csv:statement.csv"
 
 class BaseImporter(ABC):
+    def __init__(self):
+        # Rows the last parse dropped, by reason ('date' / 'amount'), so callers can report them
+        self.skipped: Dict[str, int] = {}
+
     @abstractmethod
     def parse(self, file_path: str, **kwargs) -> List[Transaction]:
         """
         Parse a file and return a list of Transaction objects.
         """
         pass
+
+    # Columns of the frame returned by parse_frame
+    FRAME_COLUMNS = ['date', 'amount', 'description', 'source']
+
+    def parse_frame(self, file_path: str, **kwargs) -> pd.DataFrame:
+        """
+        Parse a file into a DataFrame with FRAME_COLUMNS, one row per transaction.
+        Importers that work on columns override this to skip building Transactions.
+        """
+        rows = [(tx.date, tx.amount, tx.description, tx.source) for tx in self.parse(file_path, **kwargs)]
+        return pd.DataFrame(rows, columns=self.FRAME_COLUMNS)
+
+    @staticmethod
+    def transactions_from_frame(frame: pd.DataFrame) -> List[Transaction]:
+        """Materialize Transactions from a parse_frame() result."""
+        return [
+            Transaction(date=date, amount=amount, description=description, source=source)
+            for date, amount, description, source in zip(
+                frame['date'].tolist(), frame['amount'].tolist(),
+                frame['description'].tolist(), frame['source'].tolist()
+            )
+        ]
         
     def normalize_date(self, date_str: str, date_format: str = None) -> str:
         """Helper to convert various date strings to ISO format."""
@@ -33,3 +62,53 @@ class BaseImporter(ABC):
         except Exception as e:
             # Fallback or re-raise
             raise ValueError(f"Could not parse date: {date_str}") from e
+
+    def _build_from_frame(self, df: pd.DataFrame, source: str, columns: Dict[str, str] = None, **kwargs) -> pd.DataFrame:
+        """
+        Turn a raw statement DataFrame into FRAME_COLUMNS using whole-column operations.
+        columns maps 'date'/'amount'/'description' to df's column names (same names by default).
+        Rows whose date or amount can't be parsed are skipped and counted in self.skipped.
+        """
+        columns = columns or {}
+        try:
+            raw_dates = df[columns.get('date', 'date')]
+            amt_series = df[columns.get('amount', 'amount')]
+            descs = df[columns.get('description', 'description')].astype(str)
+        except KeyError:
+            return pd.DataFrame(columns=self.FRAME_COLUMNS)
+
+        # Cleanup Amount: strip currency symbols and thousands separators from text columns
+        if amt_series.dtype == object or pd.api.types.is_string_dtype(amt_series):
+            amt_series = (amt_series.astype(str)
+                          .str.replace('$', '', regex=False)
+                          .str.replace(',', '', regex=False))
+        amounts = pd.to_numeric(amt_series, errors='coerce').to_numpy(dtype=float)
+
+        # Some banks show expenses as negative numbers; we store them positive
+        if kwargs.get('invert_negative', False):
+            amounts = np.abs(amounts)
+
+        # Date parsing: user can pass 'date_format' in kwargs. Values pandas
+        # can't handle in one pass fall back to the per-row dateutil parser.
+        date_format = kwargs.get('date_format')
+        try:
+            dates = pd.to_datetime(raw_dates, format=date_format, errors='coerce')
+        except (ValueError, TypeError):
+            dates = pd.Series(pd.NaT, index=raw_dates.index, dtype='datetime64[ns]')
+        iso_dates = dates.dt.strftime('%Y-%m-%dT%H:%M:%S').to_numpy(dtype=object)
+        for i in np.flatnonzero(dates.isna().to_numpy() & raw_dates.notna().to_numpy()):
+            try:
+                iso_dates[i] = self.normalize_date(str(raw_dates.iloc[i]), date_format)
+            except ValueError:
+                pass
+
+        bad_dates = pd.isna(iso_dates)
+        bad_amounts = np.isnan(amounts)
+        self.skipped = {'date': int(bad_dates.sum()), 'amount': int((bad_amounts & ~bad_dates).sum())}
+        valid = ~bad_amounts & ~bad_dates
+        return pd.DataFrame({
+            'date': iso_dates[valid],
+            'amount': amounts[valid],
+            'description': descs.to_numpy()[valid],
+            'source': source,
+        }, columns=self.FRAME_COLUMNS)
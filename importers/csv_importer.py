@@ -2,7 +2,25 @@ import pandas as pd
 from typing import List, Dict, Optional
 from .base import BaseImporter, Transaction
 
+# Optional multi-threaded CSV reader
+try:
+    import pyarrow.csv as pa_csv
+    HAS_pyarrow = True
+except ImportError:
+    HAS_pyarrow = False
+
 class CSVImporter(BaseImporter):
+    # Lower-cased header -> (field, preference), most preferred first per field
+    _COLUMN_CANDIDATES = {
+        candidate: (field, rank)
+        for field, candidates in {
+            'date': ['date', 'txn date', 'transaction date', 'posting date'],
+            'amount': ['amount', 'amt', 'value', 'transaction amount'],
+            'description': ['description', 'desc', 'payee', 'merchant', 'narrative', 'transaction description'],
+        }.items()
+        for rank, candidate in enumerate(candidates)
+    }
+
     def __init__(self):
         super().__init__()
         self.mapping = {} # Column mapping: {'date': 'Date', 'amount': 'Amount', ...}
@@ -11,6 +29,9 @@ class CSVImporter(BaseImporter):
         self.mapping = mapping
 
     def parse(self, file_path: str, **kwargs) -> List[Transaction]:
+        return self.transactions_from_frame(self.parse_frame(file_path, **kwargs))
+
+    def parse_frame(self, file_path: str, **kwargs) -> pd.DataFrame:
         """
         Parse CSV file using pandas.
         kwargs can include 'encoding', 'delimiter', 'skip_rows'.
@@ -19,11 +40,29 @@ class CSVImporter(BaseImporter):
         delimiter = kwargs.get('delimiter', ',')
         skiprows = kwargs.get('skip_rows', 0)
         
-        try:
-            df = pd.read_csv(file_path, encoding=encoding, sep=delimiter, skiprows=skiprows)
-        except Exception as e:
-            raise ValueError(f"Failed to read CSV: {e}")
+        df = None
+        if HAS_pyarrow and len(delimiter) == 1:
+            try:
+                table = pa_csv.read_csv(
+                    file_path,
+                    read_options=pa_csv.ReadOptions(skip_rows=skiprows, encoding=encoding),
+                    parse_options=pa_csv.ParseOptions(delimiter=delimiter),
+                )
+                df = table.to_pandas(self_destruct=True)
+            except Exception:
+                df = None # e.g. ragged rows, which the pandas reader copes with
 
+        if df is None:
+            try:
+                df = pd.read_csv(file_path, encoding=encoding, sep=delimiter, skiprows=skiprows)
+            except Exception as e:
+                raise ValueError(f"Failed to read CSV: {e}")
+
+        self._ensure_mapping(df, **kwargs)
+        return self._build_from_frame(df, f"csv:{file_path}", self.mapping, **kwargs)
+
+    def _ensure_mapping(self, df: pd.DataFrame, **kwargs):
+        """Apply a mapping passed in kwargs, or auto-detect one from the headers."""
         # If mapping provided via kwargs, use it
         if 'mapping' in kwargs:
             self.set_mapping(kwargs['mapping'])
@@ -50,74 +89,14 @@ class CSVImporter(BaseImporter):
         if not self.mapping:
              raise ValueError("Column mapping not configured.")
 
-        transactions = []
-        for _, row in df.iterrows():
-            try:
-                date_str = str(row[self.mapping['date']])
-                amount_val = row[self.mapping['amount']]
-                desc_str = str(row[self.mapping['description']])
-                
-                # Cleanup Amount
-                if isinstance(amount_val, str):
-                    amount_val = amount_val.replace('$', '').replace(',', '')
-                    # Handle debit/credit indicators if needed (e.g. "100 CR")
-                    # For now assume standard float-able string
-                
-                amount = float(amount_val)
-                
-                # Invert amount if needed (some banks show debits as positive, we want expenses negative? or positive?)
-                # dot-spend likely treats expenses as positive numbers in input, or negative?
-                # Let's check existing data model.
-                # main.py: add command takes positive amount. 
-                # Import usually brings negative numbers for expenses.
-                # We should convert to positive for expenses? 
-                # Let's check `add_expense` in `datastore.py`.
-                # entry['amount'] = amount. So we store what we get.
-                # Usually TUI shows positive.
-                # If bank statement has -50.00 for grocery:
-                # We want to store 50.00.
-                if kwargs.get('invert_negative', False) and amount < 0:
-                    amount = abs(amount)
-                elif kwargs.get('invert_positive', False): # For credit card statements where 50.00 is a charge
-                    pass # Keep as positive
-
-                # Date parsing
-                # user can pass 'date_format' in kwargs
-                date_iso = self.normalize_date(date_str, kwargs.get('date_format'))
-
-                transactions.append(Transaction(
-                    date=date_iso,
-                    amount=amount,
-                    description=desc_str,
-                    source=f"csv:{file_path}"
-                ))
-            except Exception as e:
-                # Log error or skip?
-                # Ideally we skip and report
-                continue
-                
-        return transactions
-
     def _auto_detect_columns(self, columns: List[str]) -> Dict[str, str]:
-        mapping = {}
-        columns_lower = [c.lower() for c in columns]
-        
-        # Date
-        for candidate in ['date', 'txn date', 'transaction date', 'posting date']:
-            if candidate in columns_lower:
-                mapping['date'] = columns[columns_lower.index(candidate)]
-                break
-        
-        # Amount
-        for candidate in ['amount', 'amt', 'value', 'transaction amount']:
-            if candidate in columns_lower:
-                mapping['amount'] = columns[columns_lower.index(candidate)]
-                break
-                
-        # Description
-        for candidate in ['description', 'desc', 'payee', 'merchant', 'narrative', 'transaction description']:
-             if candidate in columns_lower:
-                mapping['description'] = columns[columns_lower.index(candidate)]
-                break
-                
-        return mapping
+        # One pass over the headers; earlier candidates win when several columns match
+        best = {}
+        for column in columns:
+            hit = self._COLUMN_CANDIDATES.get(str(column).lower())
+            if hit is None:
+                continue
+            field, rank = hit
+            if field not in best or rank < best[field][0]:
+                best[field] = (rank, column)
+        return {field: column for field, (rank, column) in best.items()}
@@ -1,38 +1,111 @@
-from typing import List, Dict
+import re
+import datetime
+import pandas as pd
+from typing import List, Dict, Iterator
 from .base import BaseImporter, Transaction
 from ofxparse import OfxParser
 
+# Optional streaming parser; ofxparse builds the whole document in memory first
+try:
+    from lxml import etree
+    HAS_lxml = True
+except ImportError:
+    HAS_lxml = False
+
+# OFX 1.x is SGML: leaf elements like <TRNAMT>-12.50 have no closing tag
+_UNCLOSED_TAG = re.compile(r"<([A-Za-z0-9_.]+)>\s*([^<\s][^<\r\n]*?)\s*(?=<(?!/\1>)|$)", re.M)
+_BARE_AMPERSAND = re.compile(r"&(?!(?:amp|lt|gt|quot|apos|#\d+);)")
+_OFX_TZ = re.compile(r"\[(?P<tz>[-+]?\d+\.?\d*)\:\w*\]$")
+
 class OFXImporter(BaseImporter):
+    # Roughly how much text is fed to the streaming parser per read
+    READ_SIZE = 64 * 1024
+
     def parse(self, file_path: str, **kwargs) -> List[Transaction]:
+        return self.transactions_from_frame(self.parse_frame(file_path, **kwargs))
+
+    def parse_frame(self, file_path: str, **kwargs) -> pd.DataFrame:
+        rows = None
+        if HAS_lxml:
+            try:
+                rows = list(self._stream_parse(file_path))
+            except Exception:
+                rows = None # Fall back to ofxparse for files the streaming parser can't handle
+
+        if rows is None:
+            try:
+                with open(file_path, 'rb') as f:
+                    ofx = OfxParser.parse(f)
+            except Exception as e:
+                raise ValueError(f"Failed to parse OFX file: {e}")
+
+            # Every account in the file, like the streaming parser
+            rows = [
+                # OFX has payeepID, name, memo
+                (tx.date, tx.amount, tx.payee or getattr(tx, 'name', None) or tx.memo)
+                for account in ofx.accounts
+                if account.statement
+                for tx in account.statement.transactions
+            ]
+
+        # OFX amount is typically signed correctly (- for debit); the shared
+        # core applies invert_negative and date normalization like the other importers
+        df = pd.DataFrame(
+            [(date, amount, desc or "Unknown") for date, amount, desc in rows],
+            columns=['date', 'amount', 'description'],
+        )
+        return self._build_from_frame(df, f"ofx:{file_path}", **kwargs)
+
+    def _stream_parse(self, file_path: str) -> Iterator[tuple]:
+        """
+        Yield (date, amount, description) per <STMTTRN> of every account while
+        reading the file, clearing each element once used so memory stays flat.
+        Malformed input raises, so the caller falls back to ofxparse.
+        """
+        parser = etree.XMLPullParser(events=('end',), tag='STMTTRN')
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            # Skip the SGML/XML header, the document proper starts at <OFX>
+            head = ""
+            for line in f:
+                start = line.find("<OFX>")
+                if start != -1:
+                    head = line[start:]
+                    break
+            else:
+                raise ValueError("No <OFX> element found")
+
+            while True:
+                chunk = f.readlines(self.READ_SIZE)
+                # Normalize whole lines only, so tags are never split
+                text = head + "".join(chunk)
+                head = ""
+                if text:
+                    text = _BARE_AMPERSAND.sub("&amp;", _UNCLOSED_TAG.sub(r"<\1>\2</\1>", text))
+                    parser.feed(text)
+                    for _, el in parser.read_events():
+                        yield (
+                            self._parse_date(el.findtext('DTPOSTED')),
+                            el.findtext('TRNAMT').strip().replace(',', '.'),
+                            (el.findtext('NAME') or el.findtext('MEMO') or "").strip(),
+                        )
+                        el.clear()
+                        while el.getprevious() is not None:
+                            del el.getparent()[0]
+                if not chunk:
+                    break
+        parser.close()
+
+    @staticmethod
+    def _parse_date(value: str) -> datetime.datetime:
+        """Same conversion as ofxparse: local OFX timestamp shifted to UTC."""
+        value = value.strip()
+        res = _OFX_TZ.search(value)
+        offset = datetime.timedelta(hours=float(res.group('tz')) if res else 0)
+        # Fixed-width fields, so slicing is much cheaper than strptime per row.
+        # Trailing time fields may be left out, e.g. YYYYMMDDHHMM.
+        fields = (value[0:4], value[4:6], value[6:8], value[8:10], value[10:12], value[12:14])
         try:
-            with open(file_path, 'rb') as f:
-                ofx = OfxParser.parse(f)
-        except Exception as e:
-            raise ValueError(f"Failed to parse OFX file: {e}")
-
-        transactions = []
-        if not ofx.account or not ofx.account.statement or not ofx.account.statement.transactions:
-            return []
-
-        for tx in ofx.account.statement.transactions:
-            # tx.date is usually a datetime object already
-            date_iso = tx.date.isoformat()
-            
-            # OFX amount is typically signed correctly (- for debit)
-            # dot-spend generally uses positive for expenses in input, but we might want to standardize
-            # For now, let's keep the raw amount or let user configure inversion
-            amount = float(tx.amount)
-            if kwargs.get('invert_negative', False) and amount < 0:
-                amount = abs(amount)
-
-            # OFX has payeepID, name, memo
-            desc = tx.payee or tx.name or tx.memo or "Unknown"
-
-            transactions.append(Transaction(
-                date=date_iso,
-                amount=amount,
-                description=desc,
-                source=f"ofx:{file_path}"
-            ))
-            
-        return transactions
+            local_date = datetime.datetime(*(int(f) for f in fields if f))
+        except ValueError:
+            local_date = datetime.datetime(*map(int, fields[:3]))
+        return local_date - offset
@@ -1,4 +1,5 @@
 import datetime
+import functools
 import pandas as pd
 import numpy as np
 import plotext as plt
@@ -13,14 +14,77 @@ from utils import parse_date
 
 console = Console()
 
+# Sparkline glyphs, lowest to highest
+_BLOCKS = np.array([" ", "▂", "▃", "▄", "▅", "▆", "▇", "█"])
+
 class InsightsEngine:
+    # Loading the compiled kernel costs ~0.25s per process, which pandas only
+    # spends on the same aggregates somewhere past ten million rows
+    FAST_STATS_MIN_ROWS = 10_000_000
+
     def __init__(self, data, budgets=None):
         self.df = pd.DataFrame(data)
         if not self.df.empty:
-            self.df['date_obj'] = self.df['timestamp'].apply(lambda x: parse_date(x))
+            self.df['date_obj'] = self._parse_timestamps(self.df['timestamp'])
             self.df['amount'] = pd.to_numeric(self.df['amount'])
+            # Few distinct categories: group on integer codes instead of hashing strings
+            self.df['category'] = self.df['category'].astype('category')
+            # Derived once here rather than in every _generate_* call
+            self.df['day'] = self.df['date_obj'].dt.normalize()
+            self.df['dow'] = self.df['date_obj'].dt.day_name()
         self.budgets = budgets or {}
 
+    @functools.cached_property
+    def _stats(self):
+        """Every aggregate the panels need, computed together on first use."""
+        amounts = self.df['amount']
+        stats = {
+            "count": len(amounts),
+            "daily": self.df.groupby('day')['amount'].sum(),
+            "by_dow": self.df.groupby('dow', sort=False)['amount'].agg(['sum', 'count']),
+        }
+        # insights_fast pulls in Numba (~0.15s), so only import it past the threshold
+        fast = None
+        if len(amounts) >= self.FAST_STATS_MIN_ROWS:
+            import insights_fast
+            if insights_fast.HAS_numba:
+                fast = self._fast_stats(insights_fast.aggregate)
+        if fast is not None:
+            stats.update(fast)
+        else:
+            stats.update({
+                "total": amounts.sum(),
+                "mean": amounts.mean(),
+                "std": amounts.std(),
+                "by_category": self.df.groupby('category', observed=True)['amount'].agg(['sum', 'count', 'mean']),
+            })
+        return stats
+
+    def _fast_stats(self, aggregate):
+        """Overall and per-category figures from one Numba pass over the amount column."""
+        categories = self.df['category'].cat
+        codes = categories.codes.to_numpy()
+        total, mean, std, sums, counts = aggregate(
+            self.df['amount'].to_numpy(dtype=np.float64), codes, len(categories.categories)
+        )
+        # observed=True semantics: only categories that actually occur
+        present = np.bincount(codes[codes >= 0], minlength=len(categories.categories)) > 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            by_category = pd.DataFrame(
+                {"sum": sums, "count": counts, "mean": sums / counts},
+                index=pd.CategoricalIndex(categories.categories, name='category'),
+            )[present]
+        return {"total": total, "mean": mean, "std": std, "by_category": by_category}
+
+    @staticmethod
+    def _parse_timestamps(timestamps: pd.Series) -> pd.Series:
+        """Parse the whole column in one go; stored timestamps are ISO 8601."""
+        try:
+            return pd.to_datetime(timestamps, format='ISO8601', errors='coerce')
+        except (ValueError, TypeError):
+            # e.g. a mix of naive and offset-aware timestamps
+            return timestamps.apply(lambda x: parse_date(x))
+
     def get_dashboard(self):
         """Generates the full dashboard layout."""
         if self.df.empty:
@@ -65,16 +129,14 @@ class InsightsEngine:
         return Panel(f"[bold white]SPENDING INSIGHTS - {today.upper()}[/bold white]", style="on blue", box=box.HEAVY)
 
     def _generate_overview(self):
-        total = self.df['amount'].sum()
-        count = len(self.df)
-        avg = self.df['amount'].mean()
+        total = self._stats["total"]
+        count = self._stats["count"]
         
         # Comparison with last month (if available) - mocked for simplicity if filtering applied
         # In a real app, we'd query full history. Here we use what's passed (filtered data).
         
         # Days with Spend
-        dates = self.df['date_obj'].dt.date.unique()
-        days_active = len(dates)
+        days_active = len(self._stats["daily"])
         
         grid = Table.grid(expand=True)
         grid.add_column()
@@ -89,7 +151,7 @@ class InsightsEngine:
 
     def _generate_trends(self):
         # Weekly trends (simplified as daily grouping)
-        daily = self.df.groupby(self.df['date_obj'].dt.date)['amount'].sum()
+        daily = self._stats["daily"]
         
         # Sparkline logic using plotext?
         # Plotext prints to stdout, capturing it is tricky.
@@ -98,21 +160,18 @@ class InsightsEngine:
         if daily.empty:
             return "No trend data."
             
-        values = daily.tail(7).values # Last 7 active days
+        values = daily.tail(7).to_numpy() # Last 7 active days
         if len(values) < 2:
             return "Need more data for trends."
             
-        # Draw charts with plain text blocks
-        blocks = [" ", "▂", "▃", "▄", "▅", "▆", "▇", "█"]
-        
-        # Normalize
-        min_v, max_v = min(values), max(values)
+        # Draw charts with plain text blocks, normalized to the 8 levels
+        min_v, max_v = values.min(), values.max()
         if max_v == min_v:
-             normalized = [0 for _ in values]
+            levels = np.zeros(len(values), dtype=np.int8)
         else:
-             normalized = [int((v - min_v) / (max_v - min_v) * 7) for v in values]
+            levels = ((values - min_v) / (max_v - min_v) * 7).astype(np.int8)
              
-        chart = "".join([blocks[n] for n in normalized])
+        chart = "".join(_BLOCKS[levels])
         
         trend_text = f"Recent Activity: {chart}\n\n"
         
@@ -126,8 +185,8 @@ class InsightsEngine:
         return trend_text
 
     def _generate_categories(self):
-        cats = self.df.groupby('category')['amount'].sum().sort_values(ascending=False).head(5)
-        total = self.df['amount'].sum()
+        cats = self._stats["by_category"]['sum'].sort_values(ascending=False).head(5)
+        total = self._stats["total"]
         
         table = Table.grid(expand=True)
         table.add_column()
@@ -143,8 +202,8 @@ class InsightsEngine:
     def _generate_predictions(self):
         # Consistency Score (Simple std dev inverse)
         if len(self.df) > 5:
-            std_dev = self.df['amount'].std()
-            mean = self.df['amount'].mean()
+            std_dev = self._stats["std"]
+            mean = self._stats["mean"]
             # Lower CV (std/mean) is better consistency
             cv = std_dev / mean if mean > 0 else 0
             score = max(0, min(100, int(100 * (1 - cv))))
@@ -159,12 +218,13 @@ class InsightsEngine:
         today = datetime.date.today()
         # Assume 30 days
         days_so_far = today.day
-        daily_avg = self.df['amount'].sum() / max(1, days_so_far)
+        total = self._stats["total"]
+        daily_avg = total / max(1, days_so_far)
         remaining = 30 - days_so_far
         if remaining > 0:
             projected = daily_avg * remaining
             text += f"\nProj. Remaining: [yellow]${projected:.2f}[/yellow]"
-            text += f"\nProj. Month Total: [bold]${(self.df['amount'].sum() + projected):.2f}[/bold]"
+            text += f"\nProj. Month Total: [bold]${(total + projected):.2f}[/bold]"
             
         return text
 
@@ -172,9 +232,8 @@ class InsightsEngine:
         if self.df.empty: return "No data."
         
         # Day of Week
-        self.df['dow'] = self.df['date_obj'].dt.day_name()
-        dow_counts = self.df['dow'].value_counts()
-        dow_sum = self.df.groupby('dow')['amount'].sum()
+        dow_counts = self._stats["by_dow"]['count']
+        dow_sum = self._stats["by_dow"]['sum']
         
         busiest_day = dow_counts.idxmax() if not dow_counts.empty else "N/A"
         expensive_day = dow_sum.idxmax() if not dow_sum.empty else "N/A"
@@ -0,0 +1,45 @@
+"""Optional Numba kernels for InsightsEngine's aggregate pass."""
+import numpy as np
+
+# Numba is optional, callers fall back to pandas groupbys without it
+try:
+    from numba import njit
+    HAS_numba = True
+except ImportError:
+    HAS_numba = False
+
+def _aggregate(amounts, cat_codes, n_cats):
+    """
+    Overall sum/mean/std plus per-category sums and counts in one kernel.
+    NaN amounts are skipped and negative codes (missing category) only count
+    toward the overall figures, matching pandas' groupby semantics.
+    """
+    total = 0.0
+    valid = 0
+    sums = np.zeros(n_cats)
+    counts = np.zeros(n_cats, dtype=np.int64)
+    for i in range(amounts.shape[0]):
+        a = amounts[i]
+        if np.isnan(a):
+            continue
+        total += a
+        valid += 1
+        c = cat_codes[i]
+        if c >= 0:
+            sums[c] += a
+            counts[c] += 1
+
+    mean = total / valid if valid > 0 else np.nan
+    # Second pass over the same array for a numerically stable std
+    sq = 0.0
+    for i in range(amounts.shape[0]):
+        a = amounts[i]
+        if not np.isnan(a):
+            sq += (a - mean) * (a - mean)
+    std = np.sqrt(sq / (valid - 1)) if valid > 1 else np.nan
+    return total, mean, std, sums, counts
+
+if HAS_numba:
+    aggregate = njit(cache=True)(_aggregate)
+else:
+    aggregate = _aggregate
@@ -1,28 +1,22 @@
 import typer
+import sys
 import json
-import csv
 import datetime
-import plotext as plt
+import heapq
+from collections import defaultdict
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
 from rich.console import Console
 from rich.table import Table
 from rich import print as rprint
-from rich import print as rprint
-import uuid
 from config import init_storage, get_data_path, get_budget_path
-from utils import get_date_range, filter_data_by_date, parse_date
+from utils import get_date_range, range_filters, parse_date, timestamp_key
 from history import HistoryManager
-from exporters import ExportManager
-from insights import InsightsEngine
 from datastore import DataStoreFactory
-from migrations import migrate_json_to_sqlite, migrate_sqlite_to_json
-from importers.csv_importer import CSVImporter
-from importers.excel_importer import ExcelImporter
-from importers.ofx_importer import OFXImporter
-from categorization import RuleCategorizer, MLCategorizer
-from deduplication import DuplicateDetector
-from sync.manager import SyncManager
-from recurring import RecurringManager
+# Heavier dependencies (plotext, pandas via exporters/insights/importers,
+# sklearn, cloud SDKs) are imported inside the commands that use them, so
+# quick commands like `status` don't pay for them on every start.
 
 history_manager = HistoryManager()
 
@@ -37,23 +31,29 @@ console = Console()
 budget_app = typer.Typer(help="Manage budgets")
 app.add_typer(budget_app, name="budget")
 
-def get_spending_for_period(category: str, period: str, data: list) -> float:
-    now = datetime.datetime.now()
+def get_period_start(period: str, now: datetime.datetime = None):
+    if now is None:
+        now = datetime.datetime.now()
     if period == "monthly":
-        start_date = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     elif period == "weekly":
         # Monday is 0
-        start_date = (now - datetime.timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
-    else:
+        return (now - datetime.timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+    return None
+
+def get_spending_for_period(category: str, period: str, store, now=None) -> float:
+    start_date = get_period_start(period, now)
+    if start_date is None:
         return 0.0
+    # The store filters and sums, so only one number comes back
+    return store.category_spend_since(category, range_filters(start_date, None)['start'])
 
-    total = 0.0
-    for item in data:
-        if item['category'].upper() == category.upper():
-            item_date = datetime.datetime.strptime(item['date'], "%Y-%m-%d %H:%M")
-            if item_date >= start_date:
-                total += item['amount']
-    return total
+def get_spending_by_category(period: str, store, now=None) -> dict:
+    """Spending per (normalized) category for the current period, in one store query."""
+    start_date = get_period_start(period, now)
+    if start_date is None:
+        return {}
+    return store.category_totals_between(range_filters(start_date, None)['start'])
 
 @budget_app.command("set")
 def budget_set(
@@ -129,7 +129,6 @@ def budget_status():
     """Check budget status."""
     store = DataStoreFactory.get_store()
     budgets = store.load_budgets()
-    data = store.get_expenses()
     
     if not budgets:
         rprint("[yellow]No budgets set.[/yellow]")
@@ -142,8 +141,14 @@ def budget_status():
     table.add_column("Remaining", style="green")
     table.add_column("Status", style="bold")
 
+    # One query per budget period rather than one per budget
+    now = datetime.datetime.now()
+    spending = {}
     for cat, info in budgets.items():
-        spent = get_spending_for_period(cat, info['period'], data)
+        period = info['period']
+        if period not in spending:
+            spending[period] = get_spending_by_category(period, store, now)
+        spent = spending[period].get(cat.upper(), 0.0)
         budget_amt = info['amount']
         remaining = budget_amt - spent
         percent = (spent / budget_amt) * 100 if budget_amt > 0 else 0
@@ -184,12 +189,14 @@ def add(
     """
     init_storage()
     store = DataStoreFactory.get_store()
+    # One clock read for the entry and the budget period below
+    now = datetime.datetime.now()
 
     entry = store.add_expense(
         amount=amount,
         category=category,
         note=note,
-        timestamp=datetime.datetime.now().isoformat()
+        timestamp=now.isoformat()
     )
     
     # Log transaction
@@ -203,11 +210,10 @@ def add(
 
     # Budget Check
     budgets = store.load_budgets()
-    data = store.get_expenses()
     cat_key = category.upper()
     if cat_key in budgets:
         info = budgets[cat_key]
-        spent = get_spending_for_period(cat_key, info['period'], data)
+        spent = get_spending_for_period(cat_key, info['period'], store, now)
         budget_amt = info['amount']
         
         if spent > budget_amt:
@@ -222,6 +228,22 @@ def add(
 
 
 
+# Above this many rows `list` prints aligned plain text instead of a Rich
+# table, whose layout costs ~0.4 ms per row
+PLAIN_LIST_THRESHOLD = 500
+
+def print_plain_table(title: str, headers: tuple, rows: list, right: tuple = ()):
+    """Write an aligned plain-text table in one go. Columns listed in `right` are right-aligned."""
+    widths = [max(map(len, column)) for column in zip(headers, *rows)]
+
+    def fmt(row):
+        return "  ".join(
+            cell.rjust(width) if i in right else cell.ljust(width)
+            for i, (cell, width) in enumerate(zip(row, widths))
+        ).rstrip()
+
+    sys.stdout.write("\n".join([title, fmt(headers), *map(fmt, rows)]) + "\n")
+
 # FIX: We rename the function to 'view_expenses' to avoid breaking Python's 'list' keyword
 # The 'name="list"' part ensures the CLI command is still 'spend list'
 @app.command(name="list")
@@ -242,32 +264,45 @@ def view_expenses(
     View expenses with date filtering.
     """
     store = DataStoreFactory.get_store()
-    data = store.get_expenses()
-    
-    if not data:
-        rprint("[yellow]No expenses found.[/yellow]")
-        return
 
     # Filter by date
     start, end = get_date_range(
         from_date, to_date, days, today, yesterday, 
         this_week, last_week, this_month, last_month, this_year
     )
-    
-    filtered_data = filter_data_by_date(data, start, end)
-    
-    if not filtered_data:
-        rprint("[yellow]No expenses found for this period.[/yellow]")
-        return
 
-    # Sort
-    sorted_data = sorted(filtered_data, key=lambda x: x['timestamp'], reverse=True)
-    
-    # Apply limit if set
-    if last:
-        display_data = sorted_data[:last]
+    if last and not start and not end:
+        # Only the newest N rows are read (an ORDER BY ... LIMIT on SQLite)
+        display_data = store.recent_expenses(last)
+        if not display_data:
+            rprint("[yellow]No expenses found.[/yellow]")
+            return
     else:
-        display_data = sorted_data
+        # The date range is applied by the store (the timestamp index on SQLite)
+        filtered_data = store.get_expenses(range_filters(start, end))
+
+        if not filtered_data:
+            if start or end:
+                rprint("[yellow]No expenses found for this period.[/yellow]")
+            else:
+                rprint("[yellow]No expenses found.[/yellow]")
+            return
+
+        # Newest first; with --last only a heap of N rows is kept instead of sorting everything
+        if last:
+            display_data = heapq.nlargest(last, filtered_data, key=itemgetter('timestamp'))
+        else:
+            display_data = sorted(filtered_data, key=itemgetter('timestamp'), reverse=True)
+
+    get_fields = itemgetter('id', 'date', 'category', 'note', 'amount')
+    rows = [
+        (expense_id, date, category, note or "", f"${amount:.2f}")
+        for expense_id, date, category, note, amount in map(get_fields, display_data)
+    ]
+
+    if len(rows) > PLAIN_LIST_THRESHOLD:
+        print_plain_table("Expense History", ("ID", "Date", "Category", "Note", "Amount"), rows, right=(0, 4))
+        return
 
     table = Table(title="Expense History", style="cyan", box=None)
     
@@ -277,14 +312,8 @@ def view_expenses(
     table.add_column("Note", style="white", justify="left")
     table.add_column("Amount", style="green", justify="right")
 
-    for item in display_data:
-        table.add_row(
-            item['id'],
-            item['date'], 
-            item['category'], 
-            item['note'], 
-            f"${item['amount']:.2f}"
-        )
+    for row in rows:
+        table.add_row(*row)
 
     console.print(table)
 
@@ -396,57 +425,68 @@ def undo(
 
     store = DataStoreFactory.get_store()
 
-    for _ in range(steps):
-        last_tx = history_manager.pop_last_transaction()
-        if not last_tx:
-            rprint("[yellow]Nothing to undo (history empty).[/yellow]")
-            break
+    # Every step lands in one transaction: a single commit, or a single
+    # rewrite of expenses.json for the JSON store. History entries are popped
+    # as we go, so if any step fails they are put back with the store rolled back.
+    popped = []
+    try:
+        with store.transaction():
+            for _ in range(steps):
+                last_tx = history_manager.pop_last_transaction()
+                if not last_tx:
+                    rprint("[yellow]Nothing to undo (history empty).[/yellow]")
+                    break
+                popped.append(last_tx)
             
-        action = last_tx['action']
-        expense_id = last_tx['expense_id']
-        rprint(f"Undoing [bold]{action}[/bold] on ID {expense_id}...", end=" ")
+                action = last_tx['action']
+                expense_id = last_tx['expense_id']
+                rprint(f"Undoing [bold]{action}[/bold] on ID {expense_id}...", end=" ")
         
-        if action == 'add':
-            # Reverse of add is delete
-            if store.delete_expense(expense_id):
-                rprint("[green]Done (Removed)[/green]")
-            else:
-                rprint("[red]Failed (Not found)[/red]")
+                if action == 'add':
+                    # Reverse of add is delete
+                    if store.delete_expense(expense_id):
+                        rprint("[green]Done (Removed)[/green]")
+                    else:
+                        rprint("[red]Failed (Not found)[/red]")
             
-        elif action == 'delete':
-            # Reverse of delete is re-add
-            if 'expense' in last_tx:
-                exp = last_tx['expense']
-                store.add_expense(
-                    amount=exp['amount'],
-                    category=exp['category'],
-                    note=exp['note'],
-                    timestamp=exp['timestamp'],
-                    expense_id=exp['id']
-                )
-                rprint("[green]Done (Restored)[/green]")
-            else:
-                rprint("[red]Failed (Missing backup data)[/red]")
-
-        elif action == 'edit':
-            # Reverse of edit is returning to 'before' state
-            if 'before' in last_tx:
-                updates = last_tx['before']
-                # We need to map 'date' back to timestamp if needed or just use updates directly
-                # update_expense expects dict of fields to update.
-                # 'before' has all fields.
+                elif action == 'delete':
+                    # Reverse of delete is re-add
+                    if 'expense' in last_tx:
+                        exp = last_tx['expense']
+                        store.add_expense(
+                            amount=exp['amount'],
+                            category=exp['category'],
+                            note=exp['note'],
+                            timestamp=exp['timestamp'],
+                            expense_id=exp['id']
+                        )
+                        rprint("[green]Done (Restored)[/green]")
+                    else:
+                        rprint("[red]Failed (Missing backup data)[/red]")
+
+                elif action == 'edit':
+                    # Reverse of edit is returning to 'before' state
+                    if 'before' in last_tx:
+                        updates = last_tx['before']
+                        # We need to map 'date' back to timestamp if needed or just use updates directly
+                        # update_expense expects dict of fields to update.
+                        # 'before' has all fields.
                 
-                # Clean up updates dict if needed, or just pass it.
-                # update_expense implementation in SQLite handles keys.
-                # But 'id' shouldn't be updated.
-                updates_clean = {k: v for k, v in updates.items() if k != 'id'}
+                        # Clean up updates dict if needed, or just pass it.
+                        # update_expense implementation in SQLite handles keys.
+                        # But 'id' shouldn't be updated.
+                        updates_clean = {k: v for k, v in updates.items() if k != 'id'}
                 
-                if store.update_expense(expense_id, updates_clean):
-                    rprint("[green]Done (Reverted)[/green]")
-                else:
-                    rprint("[red]Failed (Item not found)[/red]")
-            else:
-                 rprint("[red]Failed (Missing state data)[/red]")
+                        if store.update_expense(expense_id, updates_clean):
+                            rprint("[green]Done (Reverted)[/green]")
+                        else:
+                            rprint("[red]Failed (Item not found)[/red]")
+                    else:
+                         rprint("[red]Failed (Missing state data)[/red]")
+    except BaseException:
+        history_manager.push_back(popped[::-1])
+        raise
+
 
 # --- HISTORY GROUP ---
 history_app = typer.Typer(help="Manage transaction history")
@@ -531,28 +571,33 @@ def graph(
     """
     Visualize spending (Budget vs Actual).
     """
+    import plotext as plt
     store = DataStoreFactory.get_store()
-    data = store.get_expenses()
     budgets = store.load_budgets()
-    
-    if not data:
-        rprint("[yellow]No data to graph.[/yellow]")
-        return
 
     # Filter by date
     start, end = get_date_range(
         from_date, to_date, days, today, yesterday, 
         this_week, last_week, this_month, last_month, this_year
     )
-    
-    filtered_data = filter_data_by_date(data, start, end)
-    
-    if not filtered_data:
-        rprint("[yellow]No data for selected period.[/yellow]")
-        return
+
+    if not start and not end:
+        # All-time totals are kept up to date by the store, no rows needed
+        spent_by_category = store.category_totals()
+        if not spent_by_category:
+            rprint("[yellow]No data to graph.[/yellow]")
+            return
+    else:
+        # Summed by the store (a GROUP BY on SQLite), only one total per category comes back
+        # Same naive ISO bounds as every other range query
+        bounds = range_filters(start, end)
+        spent_by_category = store.category_totals_between(bounds.get('start'), bounds.get('end'))
+        if not spent_by_category:
+            rprint("[yellow]No data for selected period.[/yellow]")
+            return
 
     # Determine unique categories
-    categories = set(item['category'] for item in filtered_data)
+    categories = set(spent_by_category)
     # We might NOT want to show all budget categories if they don't have spend in this period?
     # Requirement: "Show budget vs actual". If we filter to "today", do we show all budget bars as empty?
     # Probably better to only show categories that have spending OR explicitly requested.
@@ -588,7 +633,7 @@ def graph(
         limit = b_info['amount'] if b_info else 0
         
         # Calculate spend in the FILTERED data
-        spent = sum(item['amount'] for item in filtered_data if item['category'] == cat)
+        spent = spent_by_category.get(cat, 0)
         
         actuals.append(spent)
         budget_vals.append(limit)
@@ -606,14 +651,9 @@ def graph(
         else:
             colors.append("blue") # No budget
 
-    plt.simple_bar(keys, actuals, width=60, title="Spending (Actual vs Budget Check)")
-    plt.bar(keys, actuals, color=colors, label="Actual")
-    # We can't easily overlay a 'line' in plotext simple_bar, but we can try a multi-bar if needed.
-    # However, color coding the actuals is the main requirement.
-    # To show the budget 'line', we could plot a second series?
-    # plt.multiple_bar(keys, [actuals, budget_vals], label=["Actual", "Budget"], color=[colors, "white"])
-    # But simple_bar is a wrapper. Let's use standard bar.
-    
+    # One figure, drawn once: simple_bar would print a chart of its own first.
+    # Plain bar keeps the per-category color coding, which multiple_bar
+    # (one color per series) can't express.
     plt.clear_figure()
     plt.bar(keys, actuals, color=colors, label="Actual")
     if any(budget_vals):
@@ -639,38 +679,45 @@ def export(
     """
     Export data with advanced options (CSV, Excel, PDF, JSON).
     """
+    from exporters import ExportManager
     store = DataStoreFactory.get_store()
-    data = store.get_expenses()
-    if not data:
-        rprint("[yellow]No data to export.[/yellow]")
-        return
-
-    # Filter by date
     start, end = get_date_range(from_date, to_date, days)
-    filtered_data = filter_data_by_date(data, start, end)
 
-    # Filter by category
-    if category:
-        filtered_data = [d for d in filtered_data if d['category'].upper() == category.upper()]
+    if format == "csv":
+        # CSV is written row by row straight from the store, never holding the whole dataset
+        rows = store.iter_expenses(range_filters(start, end, category=category))
+        first = next(rows, None)
+        if first is None:
+            rprint("[yellow]No data matches the filter for export.[/yellow]")
+            return
+        exported_path = ExportManager.stream_csv(
+            chain((first,), rows), path, delimiter=delimiter, fields=fields
+        )
+    else:
+        # The store applies both the date range and the category
+        filtered_data = store.get_expenses(range_filters(start, end, category=category))
+
+        if not filtered_data:
+            if start or end or category:
+                rprint("[yellow]No data matches the filter for export.[/yellow]")
+            else:
+                rprint("[yellow]No data to export.[/yellow]")
+            return
 
-    if not filtered_data:
-        rprint("[yellow]No data matches the filter for export.[/yellow]")
-        return
+        # Delegate to ExportManager
+        exporter = ExportManager(filtered_data)
 
-    # Delegate to ExportManager
-    exporter = ExportManager(filtered_data)
-    
-    # Check if path is a directory or file
-    # If it's a directory (default '.'), ExportManager handles filename generation
-    # If it's a file, we use it.
-    
-    exported_path = exporter.export(
-        format=format,
-        path=path,
-        fields=fields,
-        delimiter=delimiter,
-        template=template
-    )
+        # Check if path is a directory or file
+        # If it's a directory (default '.'), ExportManager handles filename generation
+        # If it's a file, we use it.
+
+        exported_path = exporter.export(
+            format=format,
+            path=path,
+            fields=fields,
+            delimiter=delimiter,
+            template=template
+        )
     
     if open_file and exported_path:
         rprint(f"Opening {exported_path}...")
@@ -694,25 +741,20 @@ def insights(
     """
     Show financial insights and trends.
     """
+    from insights import InsightsEngine
     store = DataStoreFactory.get_store()
-    data = store.get_expenses()
-    if not data:
-        rprint("[yellow]No data available.[/yellow]")
-        return
-
-    # Filter by date
+    # The store applies both the date range and the category
     start, end = get_date_range(from_date, to_date, days)
-    filtered_data = filter_data_by_date(data, start, end)
-
-    # Filter by category
-    if category:
-        filtered_data = [d for d in filtered_data if d['category'].upper() == category.upper()]
+    filtered_data, budgets = store.snapshot(range_filters(start, end, category=category))
 
     if not filtered_data:
-        rprint("[yellow]No data matches filter.[/yellow]")
+        if start or end or category:
+            rprint("[yellow]No data matches filter.[/yellow]")
+        else:
+            rprint("[yellow]No data available.[/yellow]")
         return
         
-    engine = InsightsEngine(filtered_data, store.load_budgets())
+    engine = InsightsEngine(filtered_data, budgets)
     engine.run_command(basic, trends, categories, predict, time)
 
 
@@ -755,18 +797,31 @@ def summary(
     Show financial summary (Total, Avg/Day, Breakdown).
     """
     store = DataStoreFactory.get_store()
-    data = store.get_expenses()
     start, end = get_date_range(
         from_date, to_date, days, today, yesterday, 
         this_week, last_week, this_month, last_month, this_year
     )
-    filtered_data = filter_data_by_date(data, start, end)
+    filtered_data = store.get_expenses(range_filters(start, end))
     
     if not filtered_data:
         rprint("[yellow]No data for selected period.[/yellow]")
         return
 
-    total_spent = sum(item['amount'] for item in filtered_data)
+    # One pass for the total, the breakdown and, when the range is open,
+    # the first and last timestamp (only those two get parsed)
+    need_span = not (start and end)
+    total_spent = 0.0
+    by_category = defaultdict(float)
+    first_key = last_key = None
+    for item in filtered_data:
+        amount = item['amount']
+        total_spent += amount
+        by_category[item['category']] += amount
+        if need_span:
+            key = timestamp_key(item['timestamp'])
+            if key:
+                if first_key is None or key < first_key: first_key = key
+                if last_key is None or key > last_key: last_key = key
     
     # Calculate days count in range
     # If range is open-ended (start=None or end=None), we can use min/max of data or just default to 1?
@@ -788,23 +843,16 @@ def summary(
             # Let's stick to the window size for consistency, unless it leads to weird low averages.
             # Actually, most robust is (max_date - min_date) from data if no filter?
             pass
-    elif filtered_data:
+    elif first_key:
         # derive from data
-        timestamps = [parse_date(x['timestamp']) for x in filtered_data]
-        min_ts = min(timestamps)
-        max_ts = max(timestamps)
+        min_ts = parse_date(first_key)
+        max_ts = parse_date(last_key)
         day_count = max(1, (max_ts - min_ts).days + 1)
     else:
         day_count = 1
 
     avg_per_day = total_spent / day_count
 
-    # Breakdown
-    by_category = {}
-    for item in filtered_data:
-        cat = item['category']
-        by_category[cat] = by_category.get(cat, 0.0) + item['amount']
-
     # Header
     range_str = "Custom Range"
     if this_month: range_str = "This Month"
@@ -824,12 +872,13 @@ def summary(
     table.add_column("Amount", justify="right")
     table.add_column("Percent", justify="right")
     
-    for cat, amount in sorted(by_category.items(), key=lambda x: x[1], reverse=True):
-        pct = (amount / total_spent) * 100
+    # Refunds can net the total to zero
+    inv_total = 100.0 / total_spent if total_spent else 0.0
+    for cat, amount in sorted(by_category.items(), key=itemgetter(1), reverse=True):
         table.add_row(
             f"{cat}:",
             f"${amount:.2f}",
-            f"({pct:.1f}%)"
+            f"({amount * inv_total:.1f}%)"
         )
     console.print(table)
     console.print("")
@@ -842,12 +891,11 @@ def status(
     """
     Get daily total.
     """
-    data = load_data()
-    today = datetime.datetime.now().strftime("%Y-%m-%d")
-    daily_total = sum(item['amount'] for item in data if item['date'].startswith(today))
+    # An index range scan on SQLite; the JSON store keeps today's total precomputed
+    daily_total = DataStoreFactory.get_store().day_total(datetime.date.today())
 
     if style == "polybar":
-        rprint(f"%{{F#ff5555}}💸 ${daily_total:.2f}%{{F-}}")
+        print(f"%{{F#ff5555}}💸 ${daily_total:.2f}%{{F-}}")
     elif style == "json":
         print(json.dumps({"text": f"${daily_total:.2f}", "class": "expense"}))
     else:
@@ -872,12 +920,14 @@ app.add_typer(migrate_app, name="migrate")
 @migrate_app.command("to-sqlite")
 def to_sqlite():
     """Migrate data from JSON to SQLite."""
+    from migrations import migrate_json_to_sqlite
     if typer.confirm("Migrate all data to SQLite? This will backup your JSON files first."):
         migrate_json_to_sqlite()
 
 @migrate_app.command("to-json")
 def to_json():
     """Migrate data from SQLite to JSON."""
+    from migrations import migrate_sqlite_to_json
     if typer.confirm("Migrate all data to JSON? This will backup your SQLite database first."):
         migrate_sqlite_to_json()
 
@@ -930,6 +980,11 @@ def import_file(
     """
     Import transactions from bank statements.
     """
+    from importers.csv_importer import CSVImporter
+    from importers.excel_importer import ExcelImporter
+    from importers.ofx_importer import OFXImporter
+    from categorization import RuleCategorizer, MLCategorizer
+    from deduplication import DuplicateDetector
     path = Path(file_path)
     if not path.exists():
         rprint(f"[red]File not found:[/red] {file_path}")
@@ -980,6 +1035,12 @@ def import_file(
     except Exception as e:
         rprint(f"[red]Import failed:[/red] {e}")
         return
+
+    # Unparseable rows are dropped by the importer; say so rather than lose them quietly
+    if importer.skipped.get('date'):
+        rprint(f"[yellow]Skipped {importer.skipped['date']} rows with an unreadable date.[/yellow]")
+    if importer.skipped.get('amount'):
+        rprint(f"[yellow]Skipped {importer.skipped['amount']} rows with an unreadable amount.[/yellow]")
         
     if not transactions:
         rprint("[yellow]No transactions found.[/yellow]")
@@ -994,30 +1055,35 @@ def import_file(
     deduper = DuplicateDetector(existing_data)
     rule_categorizer = RuleCategorizer() # Config path optional
     ml_categorizer = MLCategorizer()
-    ml_categorizer.train(existing_data)
-    
-    new_txs = []
+    # Refitting is skipped when the history it was trained on hasn't changed
+    from config import DATA_DIR
+    ml_categorizer.ensure_trained(existing_data, DATA_DIR / "categorizer")
     
     # Process transactions
     stats = {"auto_cat": 0, "duplicates": 0, "new": 0}
     
-    for tx in transactions:
-        # Check Duplicate
-        if skip_duplicates and deduper.is_duplicate(tx):
-            stats["duplicates"] += 1
-            continue
-            
-        # Auto-categorize
-        cat = rule_categorizer.categorize(tx.description, tx.amount)
-        if not cat:
-            cat = ml_categorizer.predict(tx.description)
-            
+    # Check Duplicate
+    if skip_duplicates:
+        new_txs = [tx for tx in transactions if not deduper.is_duplicate(tx)]
+        stats["duplicates"] = len(transactions) - len(new_txs)
+    else:
+        new_txs = list(transactions)
+    stats["new"] = len(new_txs)
+
+    # Auto-categorize as a batch: rules first, then one model call for the rest
+    categories = rule_categorizer.categorize_many(
+        [tx.description for tx in new_txs], [tx.amount for tx in new_txs]
+    )
+    missing = [i for i, cat in enumerate(categories) if not cat]
+    if missing:
+        predicted = ml_categorizer.predict_many([new_txs[i].description for i in missing])
+        for i, cat in zip(missing, predicted):
+            categories[i] = cat
+
+    for tx, cat in zip(new_txs, categories):
         if cat:
             tx.category = cat
             stats["auto_cat"] += 1
-        
-        new_txs.append(tx)
-        stats["new"] += 1
 
     rprint(f"Stats: {stats['new']} new ({stats['auto_cat']} auto-categorized), {stats['duplicates']} duplicates skipped.")
 
@@ -1059,15 +1125,20 @@ def import_file(
         return
         
     # Save
-    count = 0
-    for tx in new_txs:
-        store.add_expense(
-            amount=tx.amount,
-            category=tx.category or "Uncategorized", 
-            note=tx.description,
-            timestamp=tx.date # ISO string
-        )
-        count += 1
+    added = store.add_expenses([
+        {
+            "amount": tx.amount,
+            "category": tx.category or "Uncategorized",
+            "note": tx.description,
+            "timestamp": tx.date # ISO string
+        }
+        for tx in new_txs
+    ])
+    # One history append for the whole import, so undo can take rows back
+    history_manager.log_transactions([
+        {"action": "add", "expense_id": entry['id'], "expense": entry} for entry in added
+    ])
+    count = len(added)
         
     rprint(f"[bold green]Successfully imported {count} transactions![/bold green]")
 
@@ -1085,7 +1156,8 @@ def sync_setup(
     """
     Setup cloud synchronization.
     """
-    manager = SyncManager()
+    from sync.manager import get_manager
+    manager = get_manager()
     
     # Interactive setup fallback
     if provider == "git" and not repo:
@@ -1109,8 +1181,9 @@ def sync_setup(
 @sync_app.command("enable")
 def sync_enable():
     """Enable automatic sync."""
+    from sync.manager import get_manager
     # Toggle config
-    manager = SyncManager()
+    manager = get_manager()
     manager.config["enabled"] = True
     manager.save_config()
     rprint("[green]Sync enabled.[/green]")
@@ -1118,7 +1191,8 @@ def sync_enable():
 @sync_app.command("disable")
 def sync_disable():
     """Disable synchronization."""
-    manager = SyncManager()
+    from sync.manager import get_manager
+    manager = get_manager()
     manager.config["enabled"] = False
     manager.save_config()
     rprint("[yellow]Sync disabled.[/yellow]")
@@ -1126,7 +1200,8 @@ def sync_disable():
 @sync_app.command("now")
 def sync_now():
     """Run manual sync."""
-    manager = SyncManager()
+    from sync.manager import get_manager
+    manager = get_manager()
     if not manager.config.get("enabled"):
         rprint("[yellow]Sync is disabled. Enable it first.[/yellow]")
         return
@@ -1134,6 +1209,8 @@ def sync_now():
     rprint("[cyan]Syncing...[/cyan]")
     # What to sync? The data files.
     from config import get_data_path, get_budget_path
+    # Fold any appended expenses back into the data file before uploading it
+    DataStoreFactory.get_store().flush()
     files = [str(get_data_path()), str(get_budget_path())]
     
     res = manager.sync_now(files)
@@ -1142,7 +1219,8 @@ def sync_now():
 @sync_app.command("status")
 def sync_status():
     """Check sync status."""
-    manager = SyncManager()
+    from sync.manager import get_manager
+    manager = get_manager()
     enabled = manager.config.get("enabled", False)
     provider = manager.config.get("provider", "None")
     
@@ -1165,46 +1243,12 @@ def version():
 completions_app = typer.Typer(help="Shell completion scripts")
 app.add_typer(completions_app, name="completions")
 
-BASH_COMPLETION = '''
-_spend_completion() {
-    local IFS=$'\\n'
-    COMPREPLY=( $(env COMP_WORDS="${COMP_WORDS[*]}" \\
-                      COMP_CWORD=$COMP_CWORD \\
-                      _SPEND_COMPLETE=bash_complete $1) )
-    return 0
-}
-complete -o default -F _spend_completion spend
-'''
-
-ZSH_COMPLETION = '''
-#compdef spend
-_spend() {
-    eval $(env _SPEND_COMPLETE=zsh_source spend)
-}
-compdef _spend spend
-'''
-
-FISH_COMPLETION = '''
-complete -c spend -f
-complete -c spend -n "__fish_use_subcommand" -a "add" -d "Add expense"
-complete -c spend -n "__fish_use_subcommand" -a "list" -d "List expenses"
-complete -c spend -n "__fish_use_subcommand" -a "delete" -d "Delete expense"
-complete -c spend -n "__fish_use_subcommand" -a "edit" -d "Edit expense"
-complete -c spend -n "__fish_use_subcommand" -a "budget" -d "Budget management"
-complete -c spend -n "__fish_use_subcommand" -a "insights" -d "Analytics"
-complete -c spend -n "__fish_use_subcommand" -a "import" -d "Import data"
-complete -c spend -n "__fish_use_subcommand" -a "export" -d "Export data"
-complete -c spend -n "__fish_use_subcommand" -a "sync" -d "Cloud sync"
-complete -c spend -n "__fish_use_subcommand" -a "tui" -d "Interactive mode"
-complete -c spend -n "__fish_use_subcommand" -a "graph" -d "Visualize data"
-complete -c spend -n "__fish_use_subcommand" -a "version" -d "Show version"
-'''
-
 @completions_app.command("show")
 def completions_show(
     shell: str = typer.Argument(..., help="Shell: bash, zsh, fish")
 ):
     """Show completion script for a shell."""
+    from completions import BASH_COMPLETION, ZSH_COMPLETION, FISH_COMPLETION
     shell = shell.lower()
     if shell == "bash":
         print(BASH_COMPLETION)
@@ -1222,6 +1266,7 @@ def completions_install(
 ):
     """Install completion script for a shell."""
     import os
+    from completions import BASH_COMPLETION, ZSH_COMPLETION, FISH_COMPLETION
     home = os.path.expanduser("~")
     shell = shell.lower()
     
@@ -1260,6 +1305,7 @@ def recurring_add(
     day: int = typer.Option(1, "--day", help="Day of week (0-6) or month (1-31)"),
 ):
     """Add a recurring expense."""
+    from recurring import RecurringManager
     mgr = RecurringManager()
     rec_id = mgr.add(amount, category, note, frequency, day)
     rprint(f"[green]Recurring expense added: {rec_id}[/green]")
@@ -1268,6 +1314,7 @@ def recurring_add(
 @recurring_app.command("list")
 def recurring_list():
     """List all recurring expenses."""
+    from recurring import RecurringManager
     mgr = RecurringManager()
     items = mgr.list_all()
     
@@ -1301,6 +1348,7 @@ def recurring_list():
 @recurring_app.command("delete")
 def recurring_delete(rec_id: str = typer.Argument(..., help="Recurring ID")):
     """Delete a recurring expense."""
+    from recurring import RecurringManager
     mgr = RecurringManager()
     if mgr.delete(rec_id):
         rprint(f"[green]Deleted recurring expense: {rec_id}[/green]")
@@ -1310,6 +1358,7 @@ def recurring_delete(rec_id: str = typer.Argument(..., help="Recurring ID")):
 @recurring_app.command("pause")
 def recurring_pause(rec_id: str = typer.Argument(..., help="Recurring ID")):
     """Pause a recurring expense."""
+    from recurring import RecurringManager
     mgr = RecurringManager()
     if mgr.pause(rec_id):
         rprint(f"[yellow]Paused: {rec_id}[/yellow]")
@@ -1319,6 +1368,7 @@ def recurring_pause(rec_id: str = typer.Argument(..., help="Recurring ID")):
 @recurring_app.command("resume")
 def recurring_resume(rec_id: str = typer.Argument(..., help="Recurring ID")):
     """Resume a paused recurring expense."""
+    from recurring import RecurringManager
     mgr = RecurringManager()
     if mgr.resume(rec_id):
         rprint(f"[green]Resumed: {rec_id}[/green]")
@@ -1328,6 +1378,7 @@ def recurring_resume(rec_id: str = typer.Argument(..., help="Recurring ID")):
 @recurring_app.command("sync")
 def recurring_sync():
     """Generate missing recurring expenses."""
+    from recurring import RecurringManager
     mgr = RecurringManager()
     store = DataStoreFactory.get_store()
     
@@ -1342,7 +1393,6 @@ def recurring_sync():
 
 
 # --- CURRENCY COMMANDS ---
-from currency import CurrencyManager, SUPPORTED_CURRENCIES, CURRENCY_SYMBOLS
 
 currency_app = typer.Typer(help="Currency management")
 app.add_typer(currency_app, name="currency")
@@ -1350,7 +1400,8 @@ app.add_typer(currency_app, name="currency")
 @currency_app.command("set")
 def currency_set(currency: str = typer.Argument(..., help="Base currency code (USD, EUR, etc.)")):
     """Set base currency."""
-    mgr = CurrencyManager()
+    from currency import get_manager, SUPPORTED_CURRENCIES
+    mgr = get_manager()
     currency = currency.upper()
     if currency not in SUPPORTED_CURRENCIES:
         rprint(f"[red]Unsupported currency: {currency}[/red]")
@@ -1365,6 +1416,7 @@ def currency_set(currency: str = typer.Argument(..., help="Base currency code (U
 @currency_app.command("list")
 def currency_list():
     """List supported currencies."""
+    from currency import SUPPORTED_CURRENCIES, CURRENCY_SYMBOLS
     table = Table(title="Supported Currencies")
     table.add_column("Code", style="cyan")
     table.add_column("Symbol")
@@ -1389,7 +1441,8 @@ def currency_list():
 @currency_app.command("rates")
 def currency_rates():
     """Show current exchange rates."""
-    mgr = CurrencyManager()
+    from currency import get_manager
+    mgr = get_manager()
     
     if mgr.is_stale():
         rprint("[yellow]Warning: Exchange rates may be stale. Run 'spend currency update'.[/yellow]")
@@ -1411,7 +1464,8 @@ def currency_rates():
 @currency_app.command("update")
 def currency_update():
     """Update exchange rates from API."""
-    mgr = CurrencyManager()
+    from currency import get_manager
+    mgr = get_manager()
     rprint("[cyan]Fetching exchange rates...[/cyan]")
     
     if mgr.update_rates():
@@ -42,13 +42,16 @@ def migrate_json_to_sqlite():
         sqlite_store.clear_all_expenses()
         
         # Expenses
-        for item in track(expenses, description="Migrating expenses..."):
-            sqlite_store.add_expense(
-                amount=item['amount'],
-                category=item['category'],
-                note=item.get('note', ''),
-                timestamp=item['timestamp']
-            )
+        rows = [
+            {
+                "amount": item['amount'],
+                "category": item['category'],
+                "note": item.get('note', ''),
+                "timestamp": item['timestamp']
+            }
+            for item in track(expenses, description="Migrating expenses...")
+        ]
+        sqlite_store.add_expenses(rows)
             
         # Budgets
         sqlite_store.save_budgets(budgets)
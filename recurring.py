@@ -1,10 +1,10 @@
 """Recurring expenses management."""
-import json
-import uuid
+import secrets
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Optional
 from config import DATA_DIR
+from utils import read_json, write_json
 
 RECURRING_FILE = DATA_DIR / "recurring.json"
 
@@ -14,19 +14,17 @@ class RecurringManager:
     
     def _load(self) -> Dict:
         if RECURRING_FILE.exists():
-            with open(RECURRING_FILE) as f:
-                return json.load(f)
+            return read_json(RECURRING_FILE)
         return {}
     
     def _save(self):
-        with open(RECURRING_FILE, "w") as f:
-            json.dump(self.recurring, f, indent=2)
+        write_json(RECURRING_FILE, self.recurring)
     
     def add(self, amount: float, category: str, note: str = "",
             frequency: str = "monthly", day: int = 1,
             start_date: str = None, end_date: str = None) -> str:
         """Add a recurring expense."""
-        rec_id = str(uuid.uuid4())[:8]
+        rec_id = secrets.token_hex(4)
         
         if not start_date:
             start_date = datetime.now().strftime("%Y-%m-%d")
@@ -110,15 +108,15 @@ class RecurringManager:
             
             # Check end date
             if rec["end_date"]:
-                end = datetime.strptime(rec["end_date"], "%Y-%m-%d")
+                end = datetime.fromisoformat(rec["end_date"])
                 if today > end:
                     continue
             
             # Determine last generated date
             if rec["last_generated"]:
-                last = datetime.strptime(rec["last_generated"], "%Y-%m-%d")
+                last = datetime.fromisoformat(rec["last_generated"])
             else:
-                last = datetime.strptime(rec["start_date"], "%Y-%m-%d") - timedelta(days=1)
+                last = datetime.fromisoformat(rec["start_date"]) - timedelta(days=1)
             
             # Generate all missing occurrences
             current = last
@@ -18,7 +18,7 @@ setup(
     packages=find_packages(),
     py_modules=["main", "config", "utils", "data", "datastore", "history", 
                 "exporters", "insights", "migrations", "categorization", 
-                "deduplication", "recurring", "currency"],
+                "deduplication", "recurring", "currency", "completions"],
     classifiers=[
         "Development Status :: 4 - Beta",
         "Environment :: Console",
@@ -1,5 +1,6 @@
-import json
+import functools
 from pathlib import Path
+from utils import read_json, write_json
 from typing import Optional
 from .base import SyncProvider, ConflictResolution
 from .providers.google_drive import GoogleDriveProvider
@@ -20,15 +21,13 @@ class SyncManager:
         from config import DATA_DIR
         config_path = DATA_DIR / "sync_config.json"
         if config_path.exists():
-            with open(config_path) as f:
-                return json.load(f)
+            return read_json(config_path)
         return {"enabled": False, "provider": None, "auto_sync": False}
 
     def save_config(self):
         from config import DATA_DIR
         config_path = DATA_DIR / "sync_config.json"
-        with open(config_path, "w") as f:
-            json.dump(self.config, f)
+        write_json(config_path, self.config)
 
     def _init_provider(self):
         if not self.config.get("enabled"): return
@@ -56,6 +55,9 @@ class SyncManager:
         self._init_provider()
         
     def sync_now(self, local_files: list):
+        # Enabled after this manager was built, e.g. by sync enable in the same process
+        if not self.provider and self.config.get("enabled"):
+            self._init_provider()
         if not self.provider: return "Sync disabled or provider not ready."
         
         # Simple Sync: Upload Local -> Remote (Last Write Wins)
@@ -66,3 +68,8 @@ class SyncManager:
             results.append(f"Upload {path}: {'OK' if success else 'Fail'}")
             
         return "\n".join(results)
+
+@functools.cache
+def get_manager() -> SyncManager:
+    """Process-wide SyncManager, so the sync config is read and the provider set up once."""
+    return SyncManager()
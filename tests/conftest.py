@@ -26,3 +26,18 @@ def expenses_file(tmp_data_dir, sample_expenses):
     with open(file_path, "w") as f:
         json.dump(sample_expenses, f)
     return file_path
+
+@pytest.fixture
+def storage_dir(tmp_data_dir, monkeypatch):
+    """Point the app's data files at a temp directory, with no store built yet."""
+    import config
+    from datastore import DataStoreFactory
+    monkeypatch.setattr(config, "DATA_DIR", tmp_data_dir)
+    monkeypatch.setattr(config, "DATA_FILE", tmp_data_dir / "expenses.json")
+    monkeypatch.setattr(config, "BUDGET_FILE", tmp_data_dir / "budgets.json")
+    monkeypatch.setattr(config, "HISTORY_FILE", tmp_data_dir / "history.jsonl")
+    monkeypatch.setattr(config, "SETTINGS_FILE", tmp_data_dir / "settings.json")
+    monkeypatch.setattr(config, "_initialized", False)
+    monkeypatch.setattr(DataStoreFactory, "_instance", None)
+    config.init_storage()
+    return tmp_data_dir
@@ -0,0 +1,173 @@
+import pytest
+import json
+
+class TestJSONAppendLog:
+    def test_compaction_keeps_rows_appended_by_another_process(self, storage_dir, monkeypatch):
+        """Test rows another store appended between our load and our append survive compaction."""
+        import datastore
+        from datastore import JSONDataStore
+        ours = JSONDataStore()
+        theirs = JSONDataStore()
+        ours.add_expense(1.0, "Food", "first", "2024-01-15T09:00:00", "ours1")
+
+        append_bytes = datastore.append_bytes
+        raced = []
+        def racing_append(path, payload):
+            # The other process lands its append just before ours
+            if not raced:
+                raced.append(True)
+                theirs.add_expense(2.0, "Food", "other", "2024-01-15T10:00:00", "theirs1")
+            append_bytes(path, payload)
+        monkeypatch.setattr(datastore, "append_bytes", racing_append)
+
+        ours.add_expense(3.0, "Food", "second", "2024-01-15T11:00:00", "ours2")
+        ours.flush()
+
+        assert not (storage_dir / "expenses.jsonl").exists()
+        on_disk = json.loads((storage_dir / "expenses.json").read_text())
+        assert sorted(e["id"] for e in on_disk) == ["ours1", "ours2", "theirs1"]
+        assert sorted(e["id"] for e in ours.get_expenses()) == ["ours1", "ours2", "theirs1"]
+
+    def test_store_and_legacy_loader_keep_separate_sidecars(self, storage_dir):
+        """Test data.load_data and the store never read each other's pickled payloads."""
+        import data
+        from datastore import JSONDataStore
+        store = JSONDataStore()
+        store.add_expense(4.0, "Food", "snack", "2024-01-15T09:00:00", "s1")
+        store.flush()
+        # The store has pickled its (rows, log count) pair for this file state
+        assert store.get_expenses()
+
+        rows = data.load_data()
+        assert isinstance(rows, list)
+        assert [e["id"] for e in rows] == ["s1"]
+
+        rows.append({"id": "d1", "amount": 6.0, "category": "FOOD", "note": "",
+                     "timestamp": "2024-01-16T09:00:00", "date": "2024-01-16 09:00"})
+        data.save_data(rows)
+        assert [e["id"] for e in data.load_data()] == ["s1", "d1"]
+        assert [e["id"] for e in JSONDataStore().get_expenses()] == ["s1", "d1"]
+
+        # And back the other way, with both sidecars current
+        assert [e["id"] for e in JSONDataStore().get_expenses()] == ["s1", "d1"]
+        assert [e["id"] for e in data.load_data()] == ["s1", "d1"]
+
+    def test_returned_rows_are_copies(self, storage_dir):
+        """Test modifying rows a read returned leaves the cache and the file alone."""
+        from datastore import JSONDataStore
+        store = JSONDataStore()
+        store.add_expense(4.0, "Food", "snack", "2024-01-15T09:00:00", "s1")
+        store.get_expenses()[0]["amount"] = 100.0
+        store.get_expenses({"category": "food"})[0]["note"] = "changed"
+        store.get_expense("s1")["category"] = "RENT"
+        store.recent_expenses(1)[0]["id"] = "other"
+        store.flush()
+
+        on_disk = json.loads((storage_dir / "expenses.json").read_text())
+        assert [(e["id"], e["amount"], e["category"], e["note"]) for e in on_disk] == [("s1", 4.0, "FOOD", "snack")]
+
+    def test_filtered_reads_use_the_pickled_rows(self, storage_dir, monkeypatch):
+        """Test a new process's filtered read takes the sidecar instead of streaming the file."""
+        from datastore import JSONDataStore
+        writer = JSONDataStore()
+        writer.add_expense(4.0, "Food", "snack", "2024-01-15T09:00:00", "s1")
+        writer.add_expense(9.0, "Rent", "rent", "2024-02-01T09:00:00", "s2")
+        JSONDataStore().get_expenses()  # a full load leaves the sidecar for this file state
+
+        def no_streaming(self):
+            raise AssertionError("streamed the file despite a current sidecar")
+        monkeypatch.setattr(JSONDataStore, "_stream_data", no_streaming)
+        reader = JSONDataStore()
+        rows = list(reader.iter_expenses({"start": "2024-01-01T00:00:00", "end": "2024-01-31T23:59:59"}))
+        assert [e["id"] for e in rows] == ["s1"]
+        assert reader._cache_is_fresh()
+
+    def test_range_filters_normalize_row_timestamps(self, storage_dir):
+        """Test tz-aware, date-only and timestamp-less rows are filtered like naive ones."""
+        from datastore import JSONDataStore
+        (storage_dir / "expenses.json").write_text(json.dumps([
+            {"id": "naive", "amount": 1.0, "category": "FOOD", "timestamp": "2024-01-15T09:00:00"},
+            {"id": "aware", "amount": 2.0, "category": "FOOD", "timestamp": "2024-01-20T09:00:00+02:00"},
+            {"id": "legacy", "amount": 4.0, "category": "FOOD", "date": "2024-01-25 10:00"},
+            {"id": "undated", "amount": 8.0, "category": "FOOD"},
+            {"id": "later", "amount": 16.0, "category": "FOOD", "timestamp": "2024-02-02T09:00:00"},
+        ]))
+        store = JSONDataStore()
+        january = {"start": "2024-01-01T00:00:00", "end": "2024-01-31T23:59:59"}
+        assert [e["id"] for e in store.iter_expenses(january)] == ["naive", "aware", "legacy"]
+        assert store.category_totals_between(january["start"], january["end"]) == {"FOOD": 7.0}
+        assert store.category_spend_since("food", "2024-01-18T00:00:00") == 22.0
+        assert len(list(store.iter_expenses())) == 5
+
+class TestJSONViews:
+    @staticmethod
+    def _assert_views_match(store, today):
+        """The stored views against a full pass over the rows, read by a fresh store too."""
+        from datastore import JSONDataStore
+        rows = JSONDataStore().get_expenses()
+        expected = {}
+        for item in rows:
+            expected[item["category"]] = expected.get(item["category"], 0.0) + item["amount"]
+        today_total = sum(item["amount"] for item in rows if item["timestamp"][:10] == today.isoformat())
+        for reader in (store, JSONDataStore()):
+            assert reader.category_totals() == pytest.approx(expected)
+            assert reader.day_total(today) == pytest.approx(today_total)
+
+    def test_totals_and_today_follow_every_write(self, storage_dir, monkeypatch):
+        """Test totals.json and today.json stay correct across writes and outside edits."""
+        import datetime
+        from datastore import JSONDataStore
+        monkeypatch.setattr(JSONDataStore, "COMPACT_THRESHOLD", 3)
+        today = datetime.date.today()
+        now = f"{today.isoformat()}T12:00:00"
+        store = JSONDataStore()
+        self._assert_views_match(store, today)
+
+        # Appends to the log
+        store.add_expense(5.0, "Food", "lunch", now, "a1")
+        store.add_expense(7.5, "Transport", "bus", "2024-01-15T08:00:00", "a2")
+        self._assert_views_match(store, today)
+        assert (storage_dir / "expenses.jsonl").exists()
+
+        # Past the threshold the log is compacted into expenses.json
+        store.add_expenses([
+            {"amount": 2.0, "category": "Food", "note": "tea", "timestamp": now, "expense_id": "a3"},
+            {"amount": 9.0, "category": "Rent", "note": "rent", "timestamp": now, "expense_id": "a4"},
+        ])
+        assert not (storage_dir / "expenses.jsonl").exists()
+        self._assert_views_match(store, today)
+
+        store.delete_expense("a1")
+        self._assert_views_match(store, today)
+
+        store.update_expense("a2", {"category": "Food", "amount": 8.0, "timestamp": now})
+        self._assert_views_match(store, today)
+
+        # Edited behind the store's back, e.g. by sync: the views must go stale
+        (storage_dir / "expenses.json").write_text(json.dumps([
+            {"id": "x1", "amount": 40.0, "category": "TRAVEL", "note": "", "timestamp": now},
+            {"id": "x2", "amount": 1.25, "category": "FOOD", "note": "", "timestamp": "2023-12-31T10:00:00"},
+        ]))
+        self._assert_views_match(store, today)
+
+class TestSQLiteResultCache:
+    def test_sees_rows_written_by_another_connection(self, storage_dir):
+        """Test cached get_expenses results are dropped once another connection commits."""
+        from datastore import SQLiteDataStore
+        reader = SQLiteDataStore()
+        writer = SQLiteDataStore()
+        try:
+            reader.add_expense(5.0, "Food", "lunch", "2024-01-15T12:00:00", "r1")
+            filters = {"start": "2024-01-01T00:00:00", "end": "2024-01-31T23:59:59"}
+            assert [e["id"] for e in reader.get_expenses(filters)] == ["r1"]
+            # Those rows are now cached on the reader
+            assert len(reader._results) == 1
+
+            writer.add_expense(7.0, "Food", "dinner", "2024-01-16T19:00:00", "w1")
+            assert sorted(e["id"] for e in reader.get_expenses(filters)) == ["r1", "w1"]
+
+            writer.delete_expense("r1")
+            assert [e["id"] for e in reader.get_expenses(filters)] == ["w1"]
+        finally:
+            reader.close()
+            writer.close()
@@ -34,7 +34,81 @@ class TestDataValidation:
             assert isinstance(expense["category"], str)
             assert len(expense["category"]) > 0
     
+    def test_category_normalization(self):
+        """Test categories are upper-cased and share one string object."""
+        from datastore import normalize_category
+        food = normalize_category("food")
+        assert food == "FOOD"
+        assert normalize_category("Food") is food
+    
     def test_valid_timestamp(self, sample_expenses):
         """Test timestamps are ISO format."""
         for expense in sample_expenses:
             assert "T" in expense["timestamp"]
+    
+    def test_json_round_trip(self, tmp_data_dir, sample_expenses):
+        """Test data files survive a write/read cycle without temp leftovers."""
+        from utils import read_json, write_json
+        path = tmp_data_dir / "expenses.json"
+        write_json(path, sample_expenses)
+        assert read_json(path) == sample_expenses
+        assert not (tmp_data_dir / "expenses.json.tmp").exists()
+
+class TestHistory:
+    def test_log_pop_and_trim(self, tmp_data_dir, monkeypatch):
+        """Test the history log appends, pops from the end and trims lazily."""
+        import history
+        monkeypatch.setattr(history, "get_history_path", lambda: tmp_data_dir / "history.jsonl")
+        manager = history.HistoryManager()
+        manager.max_history = 4
+        for i in range(7):
+            manager.log_transaction("add", f"e{i}")
+        assert [tx["expense_id"] for tx in manager.get_history(10)] == ["e3", "e4", "e5", "e6"]
+        assert manager.pop_last_transaction()["expense_id"] == "e6"
+        assert [tx["expense_id"] for tx in manager.get_history(2)] == ["e4", "e5"]
+
+class TestRangeBounds:
+    def test_aware_period_start_matches_naive_rows(self, storage_dir):
+        """Test a tz-aware 'now' still gives naive ISO bounds the stored rows compare against."""
+        import datetime
+        import main
+        from datastore import JSONDataStore
+        store = JSONDataStore()
+        store.add_expense(5.0, "Food", "midnight", "2024-01-01T00:00:00", "m1")
+        now = datetime.datetime(2024, 1, 3, 12, 0, tzinfo=datetime.timezone.utc)
+        assert main.get_spending_for_period("FOOD", "weekly", store, now) == 5.0
+        assert main.get_spending_by_category("weekly", store, now) == {"FOOD": 5.0}
+
+class TestUndo:
+    @pytest.mark.parametrize("backend", ["json", "sqlite"])
+    def test_failed_step_leaves_store_and_history_unchanged(self, storage_dir, monkeypatch, backend):
+        """Test a multi-step undo that fails part way is undone as a whole."""
+        import main
+        from datastore import DataStoreFactory, JSONDataStore, SQLiteDataStore
+        from history import HistoryManager
+        store = JSONDataStore() if backend == "json" else SQLiteDataStore()
+        monkeypatch.setattr(DataStoreFactory, "_instance", store)
+        history = HistoryManager()
+        monkeypatch.setattr(main, "history_manager", history)
+
+        for expense_id in ("first1", "second2"):
+            entry = store.add_expense(10.0, "Food", expense_id, "2024-01-15T12:00:00", expense_id)
+            history.log_transaction("add", expense_id, expense=entry)
+
+        delete_expense = store.delete_expense
+        def failing_delete(expense_id):
+            if expense_id == "first1":
+                raise RuntimeError("disk full")
+            return delete_expense(expense_id)
+        monkeypatch.setattr(store, "delete_expense", failing_delete)
+
+        with pytest.raises(RuntimeError):
+            main.undo(steps=2)
+
+        assert sorted(e["id"] for e in store.get_expenses()) == ["first1", "second2"]
+        assert [tx["expense_id"] for tx in history.get_history()] == ["first1", "second2"]
+        if backend == "json":
+            # Nothing half-done was written out either
+            assert sorted(e["id"] for e in JSONDataStore().get_expenses()) == ["first1", "second2"]
+        else:
+            store.close()
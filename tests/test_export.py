@@ -0,0 +1,60 @@
+import pytest
+import csv
+
+class TestCSVExport:
+    def test_stream_csv_header_order_and_quoting(self, tmp_path):
+        """Test streamed CSV has ordered columns, rows in input order, quoted notes and a footer."""
+        from exporters import ExportManager
+        rows = [
+            {"id": "b2", "timestamp": "2024-01-16T10:00:00", "date": "2024-01-16 10:00",
+             "amount": 12, "category": "FOOD", "note": "Lunch, with team"},
+            {"id": "a1", "timestamp": "2024-01-15T09:00:00", "date": "2024-01-15 09:00",
+             "amount": 3.5, "category": "TRANSPORT", "note": "Bus\nthen \"train\""},
+        ]
+        target = tmp_path / "out.csv"
+        assert ExportManager.stream_csv(iter(rows), str(target)) == target
+
+        with open(target, newline="", encoding="utf-8") as f:
+            written = list(csv.reader(f))
+        assert written == [
+            ["id", "date", "category", "note", "amount"],
+            ["b2", "2024-01-16 10:00", "FOOD", "Lunch, with team", "12.0"],
+            ["a1", "2024-01-15 09:00", "TRANSPORT", "Bus\nthen \"train\"", "3.5"],
+            ["TOTAL", "", "Count: 2", "", "15.5"],
+        ]
+        raw = target.read_text(encoding="utf-8")
+        assert '"Lunch, with team"' in raw
+        assert '"Bus\nthen ""train"""' in raw
+
+    def test_stream_csv_empty(self, tmp_path):
+        """Test nothing is written for no rows."""
+        from exporters import ExportManager
+        assert ExportManager.stream_csv(iter(()), str(tmp_path / "out.csv")) is None
+        assert not (tmp_path / "out.csv").exists()
+
+    def test_stream_csv_matches_dataframe_export_with_missing_amount(self, tmp_path):
+        """Test a row without an amount is written and totalled like the DataFrame export does."""
+        from exporters import ExportManager
+        rows = [
+            {"id": "a1", "timestamp": "2024-01-15T09:00:00", "date": "2024-01-15 09:00",
+             "amount": 3.5, "category": "FOOD", "note": "tea"},
+            {"id": "a2", "timestamp": "2024-01-16T09:00:00", "date": "2024-01-16 09:00",
+             "amount": None, "category": "FOOD", "note": "pending"},
+        ]
+        streamed = ExportManager.stream_csv(iter(rows), str(tmp_path / "streamed.csv"))
+        framed = ExportManager(rows).export("csv", str(tmp_path / "framed.csv"))
+        assert streamed.read_text(encoding="utf-8") == framed.read_text(encoding="utf-8")
+        with open(streamed, newline="", encoding="utf-8") as f:
+            written = list(csv.reader(f))
+        assert written[2] == ["a2", "2024-01-16 09:00", "FOOD", "pending", ""]
+        assert written[-1] == ["TOTAL", "", "Count: 2", "", "3.5"]
+
+    def test_stream_csv_failure_leaves_no_file(self, tmp_path):
+        """Test a row that can't be written removes the partial file."""
+        from exporters import ExportManager
+        rows = [
+            {"id": "a1", "amount": 3.5, "category": "FOOD"},
+            {"id": "a2", "amount": "n/a", "category": "FOOD"},
+        ]
+        assert ExportManager.stream_csv(iter(rows), str(tmp_path / "out.csv")) is None
+        assert not (tmp_path / "out.csv").exists()
@@ -16,6 +16,210 @@ class TestCSVImport:
         """Test OFX format detection."""
         path = Path("statement.ofx")
         assert path.suffix == ".ofx"
+    
+    def test_csv_parse_cleans_and_skips_rows(self, tmp_path):
+        """Test amounts are cleaned, mixed dates parsed and bad rows dropped."""
+        from importers.csv_importer import CSVImporter
+        csv_file = tmp_path / "statement.csv"
+        csv_file.write_text(
+            'Date,Amount,Description\n'
+            '2024-01-05,"$1,200.50",Rent\n'
+            'Jan 7 2024,-5,Lunch\n'
+            'junk,3,Bad date\n'
+            '2024-01-08,abc,Bad amount\n'
+        )
+        importer = CSVImporter()
+        transactions = importer.parse(str(csv_file), invert_negative=True)
+        assert [(t.date, t.amount, t.description) for t in transactions] == [
+            ("2024-01-05T00:00:00", 1200.5, "Rent"),
+            ("2024-01-07T00:00:00", 5.0, "Lunch"),
+        ]
+        # Dropped rows are counted so the import can report them, per importer
+        assert importer.skipped == {"date": 1, "amount": 1}
+        assert CSVImporter().skipped == {}
+
+OFX_STATEMENT = """\
+OFXHEADER:100
+DATA:OFXSGML
+VERSION:102
+SECURITY:NONE
+ENCODING:USASCII
+CHARSET:1252
+COMPRESSION:NONE
+OLDFILEUID:NONE
+NEWFILEUID:NONE
+
+<OFX>
+<SIGNONMSGSRSV1>
+<SONRS>
+<STATUS>
+<CODE>0
+<SEVERITY>INFO
+</STATUS>
+<DTSERVER>20240131120000
+<LANGUAGE>ENG
+</SONRS>
+</SIGNONMSGSRSV1>
+<BANKMSGSRSV1>
+<STMTTRNRS>
+<TRNUID>1
+<STATUS>
+<CODE>0
+<SEVERITY>INFO
+</STATUS>
+<STMTRS>
+<CURDEF>USD
+<BANKACCTFROM>
+<BANKID>123
+<ACCTID>456
+<ACCTTYPE>CHECKING
+</BANKACCTFROM>
+<BANKTRANLIST>
+<DTSTART>20240101
+<DTEND>20240131
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20240105120000[-5:EST]
+<TRNAMT>-12,50
+<FITID>1
+<NAME>BARNES & NOBLE
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20240107
+<TRNAMT>-40.00
+<FITID>2
+<MEMO>AT&T BILL
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>202401101530[+1:CET]
+<TRNAMT>100.25
+<FITID>3
+<NAME>REFUND
+</STMTTRN>
+</BANKTRANLIST>
+<LEDGERBAL>
+<BALAMT>100.00
+<DTASOF>20240131
+</LEDGERBAL>
+</STMTRS>
+</STMTTRNRS>
+</BANKMSGSRSV1>
+<BANKMSGSRSV1>
+<STMTTRNRS>
+<TRNUID>2
+<STATUS>
+<CODE>0
+<SEVERITY>INFO
+</STATUS>
+<STMTRS>
+<CURDEF>USD
+<BANKACCTFROM>
+<BANKID>123
+<ACCTID>789
+<ACCTTYPE>SAVINGS
+</BANKACCTFROM>
+<BANKTRANLIST>
+<DTSTART>20240101
+<DTEND>20240131
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20240112
+<TRNAMT>-7.25
+<FITID>4
+<NAME>SAVINGS FEE
+</STMTTRN>
+</BANKTRANLIST>
+<LEDGERBAL>
+<BALAMT>10.00
+<DTASOF>20240131
+</LEDGERBAL>
+</STMTRS>
+</STMTTRNRS>
+</BANKMSGSRSV1>
+<CREDITCARDMSGSRSV1>
+<CCSTMTTRNRS>
+<TRNUID>3
+<STATUS>
+<CODE>0
+<SEVERITY>INFO
+</STATUS>
+<CCSTMTRS>
+<CURDEF>USD
+<CCACCTFROM>
+<ACCTID>4111
+</CCACCTFROM>
+<BANKTRANLIST>
+<DTSTART>20240101
+<DTEND>20240131
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20240114
+<TRNAMT>-3.10
+<FITID>5
+<MEMO>PARKING
+</STMTTRN>
+</BANKTRANLIST>
+<LEDGERBAL>
+<BALAMT>-3.10
+<DTASOF>20240131
+</LEDGERBAL>
+</CCSTMTRS>
+</CCSTMTTRNRS>
+</CREDITCARDMSGSRSV1>
+</OFX>
+"""
+
+class TestOFXImport:
+    def test_streaming_parser_matches_ofxparse(self, tmp_path, monkeypatch):
+        """Test the lxml streaming path returns what the ofxparse path does, across accounts."""
+        pytest.importorskip("lxml")
+        pytest.importorskip("ofxparse")
+        from importers import ofx_importer
+        ofx_file = tmp_path / "statement.ofx"
+        ofx_file.write_text(OFX_STATEMENT)
+
+        # Streaming parser only: ofxparse must not be reached
+        def no_fallback(*args, **kwargs):
+            raise AssertionError("fell back to ofxparse")
+        with monkeypatch.context() as m:
+            m.setattr(ofx_importer.OfxParser, "parse", no_fallback)
+            streamed = ofx_importer.OFXImporter().parse_frame(str(ofx_file), invert_negative=True)
+
+        monkeypatch.setattr(ofx_importer, "HAS_lxml", False)
+        parsed = ofx_importer.OFXImporter().parse_frame(str(ofx_file), invert_negative=True)
+
+        # Two bank accounts and a credit card; unclosed SGML tags, bare '&',
+        # tz-shifted DTPOSTED (incl. a short YYYYMMDDHHMM form) and a
+        # decimal-comma amount
+        assert streamed.to_dict('records') == parsed.to_dict('records')
+        assert [(r['date'], r['amount'], r['description']) for r in streamed.to_dict('records')] == [
+            ("2024-01-05T17:00:00", 12.5, "BARNES & NOBLE"),
+            ("2024-01-07T00:00:00", 40.0, "AT&T BILL"),
+            ("2024-01-09T23:00:00", 100.25, "REFUND"),
+            ("2024-01-12T00:00:00", 7.25, "SAVINGS FEE"),
+            ("2024-01-14T00:00:00", 3.1, "PARKING"),
+        ]
+
+    def test_malformed_file_falls_back_to_ofxparse(self, tmp_path, monkeypatch):
+        """Test input the streaming parser rejects is handed to the tolerant ofxparse path."""
+        pytest.importorskip("lxml")
+        pytest.importorskip("ofxparse")
+        from importers import ofx_importer
+        ofx_file = tmp_path / "statement.ofx"
+        # An aggregate that is never closed
+        ofx_file.write_text(OFX_STATEMENT.replace("</BANKTRANLIST>\n", "", 1))
+
+        calls = []
+        parse = ofx_importer.OfxParser.parse
+        def spy(*args, **kwargs):
+            calls.append(True)
+            return parse(*args, **kwargs)
+        monkeypatch.setattr(ofx_importer.OfxParser, "parse", spy)
+        frame = ofx_importer.OFXImporter().parse_frame(str(ofx_file))
+        assert calls
+        assert list(frame['description'])[:3] == ["BARNES & NOBLE", "AT&T BILL", "REFUND"]
 
 class TestColumnMapping:
     def test_auto_detect_date_column(self):
@@ -43,3 +247,67 @@ class TestCategorization:
                 category = cat
                 break
         assert category == "Transport"
+    
+    def test_rule_categorizer_respects_rule_order(self):
+        """Test the first matching rule wins, not the leftmost match."""
+        from categorization import RuleCategorizer
+        categorizer = RuleCategorizer()
+        assert categorizer.categorize("PIZZA HUT VIA UBER") == "Transport"
+        assert categorizer.categorize("Whole Foods Market") == "Groceries"
+        assert categorizer.categorize("RANDOM MERCHANT") is None
+    
+    def test_rule_categorizer_amount_bounds(self):
+        """Test rules outside their amount range fall through to later rules."""
+        from categorization import RuleCategorizer
+        categorizer = RuleCategorizer()
+        categorizer.rules = [
+            {"pattern": "AMAZON", "category": "Electronics", "min_amount": 100},
+            {"pattern": "AMAZON", "category": "Shopping"},
+        ]
+        categorizer._compile_rules()
+        assert categorizer.categorize("AMAZON.COM", 250) == "Electronics"
+        assert categorizer.categorize("AMAZON.COM", 20) == "Shopping"
+
+    def test_ml_categorizer_reuses_saved_model(self, tmp_path, monkeypatch):
+        """Test the model is only refitted when the training data changes."""
+        import categorization
+        if not categorization.HAS_sklearn:
+            pytest.skip("scikit-learn not installed")
+        history = [{"note": f"coffee shop {i}", "category": "DINING"} for i in range(6)]
+        history += [{"note": f"bus ticket {i}", "category": "TRANSPORT"} for i in range(6)]
+        model_path = tmp_path / "categorizer"
+
+        first = categorization.MLCategorizer()
+        first.ensure_trained(history, model_path)
+        assert first.is_trained
+        # Weights are kept sparse, and incremental updates still work on them
+        import scipy.sparse
+        assert scipy.sparse.issparse(first.model.named_steps['clf'].coef_)
+        first.update([{"note": "coffee beans", "category": "DINING"}])
+        assert scipy.sparse.issparse(first.model.named_steps['clf'].coef_)
+        assert first.predict("coffee shop") == "DINING"
+
+        fits = []
+        monkeypatch.setattr(categorization.MLCategorizer, "_fit", lambda self, d, c: fits.append(d))
+        second = categorization.MLCategorizer()
+        second.ensure_trained(history, model_path)
+        assert fits == []
+        assert second.predict("coffee shop") == first.predict("coffee shop")
+
+        second.ensure_trained(history + [{"note": "taxi", "category": "TRANSPORT"}], model_path)
+        assert len(fits) == 1
+
+class TestDuplicateDetection:
+    def test_detects_duplicate_within_tolerance(self, sample_expenses):
+        """Test a re-imported row within a day is flagged."""
+        from deduplication import DuplicateDetector
+        detector = DuplicateDetector(sample_expenses)
+        tx = {"amount": 50.00, "note": "uber", "timestamp": "2024-01-16T09:00:00"}
+        assert detector.is_duplicate(tx) is True
+    
+    def test_ignores_different_amount_or_date(self, sample_expenses):
+        """Test rows with other amounts or far-off dates are not flagged."""
+        from deduplication import DuplicateDetector
+        detector = DuplicateDetector(sample_expenses)
+        assert detector.is_duplicate({"amount": 51.00, "note": "Uber", "timestamp": "2024-01-15T14:00:00"}) is False
+        assert detector.is_duplicate({"amount": 50.00, "note": "Uber", "timestamp": "2024-01-20T14:00:00"}) is False
@@ -5,6 +5,8 @@ from textual.screen import Screen
 from textual.reactive import reactive
 from textual.message import Message
 import datetime
+import heapq
+from operator import itemgetter
 from datastore import DataStoreFactory
 from uuid import uuid4
 
@@ -43,7 +45,7 @@ class Dashboard(Screen):
         table = self.query_one("#recent-table", DataTable)
         table.clear(columns=True)
         table.add_columns("Date", "Category", "Amount", "Note")
-        for item in sorted(data, key=lambda x: x['timestamp'], reverse=True)[:5]:
+        for item in heapq.nlargest(5, data, key=itemgetter('timestamp')):
              table.add_row(item['date'], item['category'], f"${item['amount']:.2f}", item['note'])
 
 class AddExpense(Screen):
@@ -112,9 +114,14 @@ class ExpenseList(Screen):
         
         store = DataStoreFactory.get_store()
         data = store.get_expenses()
-        for item in sorted(data, key=lambda x: x['timestamp'], reverse=True):
-            if query.lower() in item['note'].lower() or query.lower() in item['category'].lower():
-                table.add_row(item['id'], item['date'], item['category'], f"${item['amount']:.2f}", item['note'])
+        # Filter first so only the matches get sorted
+        query = query.lower()
+        matches = [
+            item for item in data
+            if query in item['note'].lower() or query in item['category'].lower()
+        ]
+        for item in sorted(matches, key=itemgetter('timestamp'), reverse=True):
+            table.add_row(item['id'], item['date'], item['category'], f"${item['amount']:.2f}", item['note'])
     
     def on_input_changed(self, event: Input.Changed) -> None:
         self.load_table(event.value)
@@ -1,6 +1,116 @@
+import os
+import pickle
 import datetime
-from typing import Tuple, Optional, List
-import dateutil.parser
+from pathlib import Path
+from typing import Tuple, Optional, Any
+
+# Prefer orjson for data files, fall back to the stdlib if it's missing
+try:
+    import orjson
+    HAS_orjson = True
+except ImportError:
+    import json
+    HAS_orjson = False
+
+def json_loads(raw) -> Any:
+    """Parses JSON from bytes or str."""
+    if HAS_orjson:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def json_dumps(data: Any, indent: bool = True) -> bytes:
+    """Serializes data to UTF-8 JSON bytes, pretty-printed unless indent=False."""
+    if HAS_orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+    # Output is UTF-8 like orjson's, so non-ASCII text needn't be escaped
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def read_json(path) -> Any:
+    """Reads and parses a JSON file in one shot."""
+    with open(path, 'rb') as f:
+        return json_loads(f.read())
+
+def write_json(path, data: Any, indent: bool = True):
+    """
+    Serializes data and writes it atomically with write_atomic.
+    Pass indent=False for bulk data nobody edits by hand.
+    """
+    write_atomic(path, json_dumps(data, indent=indent))
+
+def write_atomic(path, payload: bytes):
+    """
+    Writes payload with a single write call.
+    The payload goes to a temp file first and is swapped in with os.replace,
+    so a crash mid-write never leaves a truncated file behind.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+def append_bytes(path, payload: bytes):
+    """
+    Appends payload with one O_APPEND write(). The kernel places each write at
+    the current end of file as a unit, so several `spend add` processes can
+    append at once without locking or interleaving records. Keep appends to
+    the log files this way; a read-modify-write there would lose lines.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            # Short writes are rare on regular files but allowed
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+def file_stamp(*paths) -> tuple:
+    """(st_mtime_ns, st_size) per path, None for missing files."""
+    stamp = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamp.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            stamp.append(None)
+    return tuple(stamp)
+
+def cache_path(path, kind: str = 'cache') -> Path:
+    """
+    Pickle sidecar holding the parsed contents of a data file. Readers that
+    pickle different shapes of the same file must use different kinds.
+    """
+    path = Path(path)
+    return path.with_name(f"{path.name}.{kind}.pkl")
+
+def cache_load(path, stamp: tuple, kind: str = 'cache') -> Optional[Any]:
+    """
+    Returns the data pickled next to path if it was saved for this exact
+    file stamp, else None. The stamp is pickled on its own ahead of the data
+    so a stale sidecar is rejected without unpickling the rows.
+    """
+    try:
+        with open(cache_path(path, kind), 'rb') as f:
+            if pickle.load(f) != stamp:
+                return None
+            return pickle.load(f)
+    except Exception:
+        return None # Missing, truncated or from an incompatible version
+
+def cache_dump(path, stamp: tuple, data: Any, kind: str = 'cache'):
+    """Pickles data next to path under stamp; failures only cost the speedup."""
+    target = cache_path(path, kind)
+    tmp_path = target.with_name(target.name + '.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(stamp, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, target)
+    except OSError:
+        pass
 
 def parse_date(date_str: str) -> datetime.datetime:
     """Parses a string into a datetime object. Returns None on failure."""
@@ -10,12 +120,30 @@ def parse_date(date_str: str) -> datetime.datetime:
     except ValueError:
         pass
     
+    # Only loaded for non-ISO input, it costs ~5 ms on every CLI start otherwise
+    import dateutil.parser
     try:
         # Flexible parsing
         return dateutil.parser.parse(date_str)
     except (ValueError, TypeError):
         return None
 
+def timestamp_key(value) -> Optional[str]:
+    """
+    Naive ISO string for a row's timestamp, which sorts like the datetime it
+    encodes. Timestamps written by the app are already in that form and are
+    returned untouched; anything else is parsed once and reformatted.
+    """
+    if not isinstance(value, str):
+        return None
+    if len(value) in (19, 26) and value[10] == 'T':
+        return value
+    parsed = parse_date(value)
+    if parsed is None:
+        return None
+    # Strip tz so aware and naive rows compare on local wall time
+    return parsed.replace(tzinfo=None).isoformat()
+
 def get_date_range(
     from_date: Optional[str] = None,
     to_date: Optional[str] = None,
@@ -79,34 +207,13 @@ def get_date_range(
 
     return start, end
 
-def filter_data_by_date(data: List[dict], start: Optional[datetime.datetime], end: Optional[datetime.datetime]) -> List[dict]:
-    """Filters the list of expense dictionaries by date range."""
-    if not start and not end:
-        return data
-        
-    filtered = []
-    for item in data:
-        try:
-            # We assume item['date'] is the ISO string or parseable
-            # In our main.py we will standardize on 'timestamp' (ISO)
-            item_dt = parse_date(item.get('timestamp', item.get('date')))
-            
-            if not item_dt:
-                continue
-                
-            # If item_dt is naive, assume local? Or should we enforce timezone awareness?
-            # For simplicity in this CLI, we'll try to compare naively if possible
-            # But parse_date might return aware if string had tz.
-            # Let's strip tz for comparison to keep it simple locally
-            item_dt = item_dt.replace(tzinfo=None)
-            
-            if start and item_dt < start:
-                continue
-            if end and item_dt > end:
-                continue
-                
-            filtered.append(item)
-        except Exception:
-            continue
-            
-    return filtered
+def range_filters(start: Optional[datetime.datetime], end: Optional[datetime.datetime], **filters) -> dict:
+    """
+    Store filters (see DataStore.get_expenses) for a get_date_range() result,
+    plus any extra filters given. Stores compare ISO timestamp strings.
+    """
+    if start:
+        filters['start'] = start.replace(tzinfo=None).isoformat()
+    if end:
+        filters['end'] = end.replace(tzinfo=None).isoformat()
+    return filters